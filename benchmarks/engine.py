@@ -0,0 +1,67 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: engine.py
+
+"""
+Compare the lookup table engine of unicode_isopsephy against the former regex based path,
+and the vectorized isopsephy_many against calculating words one by one.
+
+Run from the repository root:
+
+python benchmarks/engine.py
+"""
+
+import os, re, sys, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from isopsephy import main
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# regexes of the former path, no longer needed by the package itself
+regex_greek_roman_values = re.compile('|'.join(main.greek_roman_values.keys()))
+regex_has_numbers = re.compile('\d')
+
+def regex_isopsephy(string):
+    """ unicode_isopsephy as it was before the lookup table engine """
+    if regex_has_numbers.search(string):
+        raise main.IsopsephyException(main.isopsephy_error_msg % string)
+    num_str = regex_greek_roman_values.sub(lambda x: '%s ' % main.greek_roman_values[x.group()], string)
+    try:
+        return sum([int(i) for i in num_str.split()])
+    except Exception:
+        raise main.IsopsephyException(main.isopsephy_error_msg % string)
+
+def load_words():
+    with open(os.path.join(root, 'john1_1.txt')) as f:
+        text = unicode(f.read(), encoding="utf-8")
+    # repeat the verse to get a corpus sized word list
+    return text.split() * 100
+
+def run(repeat = 5, number = 20):
+    words = load_words()
+    # make sure both paths agree before timing them
+    assert map(regex_isopsephy, words) == map(main.unicode_isopsephy, words)
+    print "%s words, %s rounds" % (len(words), number)
+    results = {}
+    for name, function in [('regex', regex_isopsephy), ('engine', main.unicode_isopsephy)]:
+        results[name] = min(timeit.repeat(lambda: map(function, words), repeat=repeat, number=number))
+        print "%-8s %.4f s" % (name, results[name])
+    print "speedup  %.1fx" % (results['regex'] / results['engine'])
+    return results
+
+def run_many(repeat = 5, number = 5):
+    words = [word.encode('utf-8') for word in load_words()] * 100
+    assert main.isopsephy_many(words).tolist() == map(main.isopsephy, words)
+    print "%s words, %s rounds" % (len(words), number)
+    results = {}
+    for name, function in [('isopsephy', lambda: map(main.isopsephy, words)),
+                           ('many', lambda: main.isopsephy_many(words))]:
+        results[name] = min(timeit.repeat(function, repeat=repeat, number=number))
+        print "%-10s %.4f s" % (name, results[name])
+    print "speedup    %.1fx" % (results['isopsephy'] / results['many'])
+    return results
+
+if __name__ == '__main__':
+    run()
+    run_many()
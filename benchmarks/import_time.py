@@ -0,0 +1,44 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: import_time.py
+
+"""
+Import time regression check. Imports isopsephy in fresh interpreters, reports the best
+time and fails if heavy optional modules got imported or the time exceeds the limit.
+
+Run from the repository root:
+
+python benchmarks/import_time.py [limit in milliseconds]
+"""
+
+import os, subprocess, sys
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# modules which must not be loaded just by importing the core api
+heavy = ['numpy', 'pandas', 'IPython', 'remarkuple']
+
+script = """
+import sys, time
+start = time.time()
+import isopsephy
+print time.time() - start
+print ' '.join(name for name in %r if name in sys.modules)
+""" % heavy
+
+def measure(repeat = 5):
+    times = []
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=root).splitlines()
+        times.append(float(output[0]))
+        loaded = output[1].split() if len(output) > 1 else []
+    return min(times), loaded
+
+if __name__ == '__main__':
+    limit = float(sys.argv[1]) if len(sys.argv) > 1 else 100.0
+    best, loaded = measure()
+    print "import isopsephy: %.1f ms (limit %.1f ms)" % (best * 1000, limit)
+    if loaded:
+        print "heavy modules imported: %s" % ', '.join(loaded)
+    if loaded or best * 1000 > limit:
+        sys.exit(1)
@@ -0,0 +1,71 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: romanizer.py
+
+"""
+Compare the unicode.translate based Romanizer against the former regex based conversion
+for greek and hebrew, word by word and as a batch, and for greek with extra digraph keys,
+where only the digraphs go through a regex.
+
+Run from the repository root:
+
+python benchmarks/romanizer.py
+"""
+
+import os, re, sys, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from romanize import el, he
+from romanize.romanizer import Romanizer
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+def regex_converter(romanizer):
+    """ Romanizer.convert as it was before the translate table """
+    regex = re.compile('|'.join(sorted(romanizer.substitutes.keys(), key=len, reverse=True)))
+    def convert(string):
+        return regex.sub(lambda x: romanizer.substitutes[x.group()], unicode(string, encoding="utf-8")).encode('utf-8')
+    return convert
+
+class digraphs(object):
+    """ Greek romanizer with roman digraphs for theta, chi and psi added """
+    data = dict(el.data)
+    for key, roman in [('theta', u'th'), ('chi', u'ch'), ('psi', u'ps')]:
+        data['%s_digraph' % key] = dict(data[key], roman=roman)
+    r = Romanizer(data)
+    @classmethod
+    def convert(cls, string):
+        return cls.r.convert(string)
+    @classmethod
+    def convert_many(cls, strings):
+        return cls.r.convert_many(strings)
+
+def load_words(module):
+    with open(os.path.join(root, 'john1_1.txt')) as f:
+        text = f.read()
+    # greek verse as such for el, and converted to roman and then to hebrew for he
+    if module is he:
+        text = he.convert(el.convert(text, True))
+    elif module is digraphs:
+        text = ' '.join([text, el.convert(text, True), 'thelo psyche chara'])
+    return text.split() * 100
+
+def run(module, repeat = 5, number = 20):
+    words = load_words(module)
+    regex = regex_converter(module.r)
+    assert map(regex, words) == map(module.convert, words) == module.convert_many(words)
+    print "%s: %s words, %s rounds" % (module.__name__, len(words), number)
+    results = {}
+    for name, function in [('regex', lambda: map(regex, words)),
+                           ('translate', lambda: map(module.convert, words)),
+                           ('many', lambda: module.convert_many(words))]:
+        results[name] = min(timeit.repeat(function, repeat=repeat, number=number))
+        print "%-10s %.4f s" % (name, results[name])
+    print "speedup    %.1fx translate, %.1fx many" % (results['regex'] / results['translate'],
+                                                     results['regex'] / results['many'])
+    return results
+
+if __name__ == '__main__':
+    run(el)
+    run(he)
+    run(digraphs)
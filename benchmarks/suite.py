@@ -0,0 +1,153 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: suite.py
+
+"""
+Micro-benchmarks for the public hot paths over several input sizes built from john1_1.txt.
+
+Run from the repository root:
+
+python benchmarks/suite.py                              # print timings
+python benchmarks/suite.py --save benchmarks/baseline.json
+python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 0.25
+
+Compare mode exits with status 1 if any benchmark is slower than the baseline by more
+than the threshold (0.25 = 25 %), so it can be used to gate upgrades. Timings are medians
+of several repeats, and benchmarks over the threshold are measured again before they are
+reported, so a single noisy measurement doesn't fail the gate. Timings depend on the
+machine, so the baseline is not kept in the repository: save one before upgrading, on the
+machine that compares. Baselines saved on another host or python are refused.
+"""
+
+import argparse, json, os, platform, sys, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import isopsephy
+from isopsephy import search
+from romanize import el
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# number of copies of the verse per input size
+sizes = [1, 10, 100]
+
+def load_text(copies):
+    with open(os.path.join(root, 'john1_1.txt')) as f:
+        verse = ' '.join(f.read().split())
+    return ' '.join([verse] * copies)
+
+def cases(copies):
+    """ Benchmark name -> function without arguments for the given input size """
+    text = load_text(copies)
+    words = text.split()
+    unicode_words = [unicode(word, encoding="utf-8") for word in words]
+    roman = isopsephy.to_roman(text)
+    numbers = isopsephy.isopsephy_many(words).tolist()
+    return {
+        'isopsephy': lambda: map(isopsephy.isopsephy, words),
+        'unicode_isopsephy': lambda: map(isopsephy.unicode_isopsephy, unicode_words),
+        'isopsephy_many': lambda: isopsephy.isopsephy_many(words),
+        'to_roman': lambda: map(isopsephy.to_roman, words),
+        'to_greek': lambda: isopsephy.to_greek(roman),
+        'preprocess_greek': lambda: isopsephy.preprocess_greek(text),
+        'find': lambda: isopsephy.find(text, 373),
+        'find_cumulative': lambda: isopsephy.find(text, 443, cumulative=True),
+        'find_cumulative_indices': lambda: search.find_cumulative_indices(numbers, 443),
+        'char_table_data': lambda: isopsephy.char_table_data(text),
+        'char_table': lambda: str(isopsephy.char_table(text)),
+        'char_table_paged': lambda: isopsephy.char_table_paged(text)._repr_html_(),
+        'romanizer_convert': lambda: el.r.convert(text),
+    }
+
+def host():
+    """ Machine and python the timings were measured with, baselines are comparable only on the same host """
+    return {'node': platform.node(), 'machine': platform.machine(), 'processor': platform.processor(),
+            'implementation': platform.python_implementation(), 'python': platform.python_version()}
+
+def measure(function, min_time = 0.2, repeat = 7):
+    """ Median time of a single call in seconds over repeat runs, each run calls for at least min_time """
+    number = 1
+    while True:
+        elapsed = timeit.timeit(function, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    times = sorted([elapsed] + timeit.repeat(function, number=number, repeat=repeat-1))
+    return times[len(times) // 2] / number
+
+def run(min_time = 0.2, only = None, keys = None):
+    """ Measure benchmarks, only the named ones if only is given and only the given keys like 'find[10]' if keys is given """
+    results = {}
+    for copies in sizes:
+        for name, function in sorted(cases(copies).items()):
+            key = '%s[%s]' % (name, copies)
+            if (only and name not in only) or (keys is not None and key not in keys):
+                continue
+            results[key] = measure(function, min_time)
+            print "%-30s %12.6f ms" % (key, results[key] * 1000)
+    return results
+
+def compare(results, baseline, threshold, confirmation = None):
+    """
+    Print ratios against baseline, return names of regressed benchmarks and of benchmarks
+    missing from baseline. With confirmation results of a second run, a benchmark regressed
+    only if it's over the threshold in both runs.
+    """
+    regressions = []
+    missing = []
+    for key in sorted(results):
+        if key not in baseline:
+            missing.append(key)
+            print "%-30s %12s    %12.6f ms %6s  MISSING" % (key, '-', results[key] * 1000, '')
+            continue
+        ratio = results[key] / baseline[key]
+        flag = ''
+        if ratio > 1 + threshold:
+            if confirmation is None:
+                flag = 'REGRESSION'
+                regressions.append(key)
+            else:
+                ratio = min(ratio, confirmation[key] / baseline[key])
+                if ratio > 1 + threshold:
+                    flag = 'REGRESSION'
+                    regressions.append(key)
+                else:
+                    flag = 'noise'
+        print "%-30s %12.6f ms %12.6f ms %6.2fx %s" % (key, baseline[key] * 1000, results[key] * 1000, ratio, flag)
+    return regressions, missing
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="isopsephy micro-benchmarks")
+    parser.add_argument('--save', help="write results to a json baseline file")
+    parser.add_argument('--compare', help="compare results to a json baseline file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown ratio, default 0.25")
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per measurement")
+    parser.add_argument('--only', nargs='*', help="run only the named benchmarks")
+    args = parser.parse_args()
+    if args.compare:
+        with open(args.compare) as f:
+            saved = json.load(f)
+        if saved.get('host') != host():
+            print "Baseline %s was measured on %s, not on this host %s, save a new one with --save" % (
+                args.compare, saved.get('host'), host())
+            sys.exit(2)
+        baseline = saved['results']
+    results = run(args.min_time, args.only)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'host': host(), 'results': results}, f, indent=2, sort_keys=True)
+    if args.compare:
+        print
+        regressions, missing = compare(results, baseline, args.threshold)
+        if regressions:
+            print
+            print "Measuring %s regression(s) again" % len(regressions)
+            confirmation = run(args.min_time, keys=regressions)
+            print
+            regressions, missing = compare(results, baseline, args.threshold, confirmation)
+        if regressions:
+            print "%s regression(s) beyond %d %%" % (len(regressions), args.threshold * 100)
+        if missing:
+            print "%s benchmark(s) missing from the baseline, refresh it with --save" % len(missing)
+        if regressions or missing:
+            sys.exit(1)
@@ -11,11 +11,22 @@ exporting:
 - IsopsephyException
 - isopsephy
 - unicode_isopsephy
+- isopsephy_many
+- engine
 - to_roman
 - to_greek
 - preprocess_roman
 - preprocess_greek
 - find
+- find_cumulative_many
+- find_positions
+- find_subsets
+- index_words
+- iter_word_values
+- find_cumulative_stream
+- set_cache_size
+- clear_cache
+- cache_info
 """
 
 from math import *
@@ -28,17 +39,63 @@ exporting:
 - digital_root_summary
 """
 
-from search import find_cumulative_indices
+from search import find_cumulative_indices, iter_cumulative_indices, find_cumulative_indices_many,\
+    find_cumulative_indices_near, find_cumulative_indices_root, find_subset_indices, find_value_indices, index_values
 
 """
 exporting:
 - find_cumulative_indices
+- iter_cumulative_indices
+- find_cumulative_indices_many
+- find_cumulative_indices_near
+- find_cumulative_indices_root
+- find_subset_indices
+- find_value_indices
+- index_values
 """
 
-from html import char_table, char_table_data
+from index import ValueIndex
+
+"""
+exporting:
+- ValueIndex
+"""
+
+from combine import vocabulary_index, find_combinations
+
+"""
+exporting:
+- vocabulary_index
+- find_combinations
+"""
+
+# html module needs IPython, pandas and remarkuple, which are loaded only when
+# the character tables are used for the first time
+
+def char_table(*args, **kw):
+    """ See html.char_table """
+    from html import char_table
+    return char_table(*args, **kw)
+
+def char_table_data(*args, **kw):
+    """ See html.char_table_data """
+    from html import char_table_data
+    return char_table_data(*args, **kw)
+
+def char_table_pages(*args, **kw):
+    """ See html.char_table_pages """
+    from html import char_table_pages
+    return char_table_pages(*args, **kw)
+
+def char_table_paged(*args, **kw):
+    """ See html.CharTablePages """
+    from html import char_table_paged
+    return char_table_paged(*args, **kw)
 
 """
 exporting:
 - char_table
 - char_table_data
-"""
\ No newline at end of file
+- char_table_pages
+- char_table_paged
+"""
@@ -0,0 +1,83 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: cache.py
+
+# fields of the circular doubly linked list items
+PREV, NEXT, KEY, VALUE = 0, 1, 2, 3
+
+class LRUCache(object):
+    """
+    Bounded least recently used memoization of a single argument function,
+    keyed by the argument, for example a word.
+
+    cached = LRUCache(unicode_isopsephy, 1000)
+    cached(u'λογος') -> 373, calculated
+    cached(u'λογος') -> 373, from cache
+
+    Maxsize 0 disables the cache and the function is called every time. When the cache
+    is full, the least recently used item is evicted. Exceptions are not cached.
+
+    Recency is kept in a circular doubly linked list of [prev, next, key, value] lists,
+    which is a lot cheaper to reorder on a hit than an OrderedDict.
+    """
+    def __init__(self, function, maxsize = 0):
+        self.function = function
+        self.maxsize = maxsize
+        self.data = {}
+        self.root = []
+        self.root[:] = [self.root, self.root, None, None]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, key):
+        if not self.maxsize:
+            return self.function(key)
+        root = self.root
+        link = self.data.get(key)
+        if link is not None:
+            self.hits += 1
+            # move the item to the most recently used end, right before root
+            prev, next = link[PREV], link[NEXT]
+            prev[NEXT] = next
+            next[PREV] = prev
+            last = root[PREV]
+            last[NEXT] = root[PREV] = link
+            link[PREV] = last
+            link[NEXT] = root
+            return link[VALUE]
+        value = self.function(key)
+        self.misses += 1
+        if len(self.data) >= self.maxsize:
+            self._evict()
+        last = root[PREV]
+        link = [last, root, key, value]
+        last[NEXT] = root[PREV] = self.data[key] = link
+        return value
+
+    def _evict(self):
+        """ Remove the least recently used item, the one right after root """
+        root = self.root
+        oldest = root[NEXT]
+        root[NEXT] = oldest[NEXT]
+        oldest[NEXT][PREV] = root
+        del self.data[oldest[KEY]]
+        self.evictions += 1
+
+    def resize(self, maxsize):
+        """ Change the size of the cache, evicting the least recently used items if needed. """
+        self.maxsize = maxsize
+        while len(self.data) > maxsize:
+            self._evict()
+        return self
+
+    def clear(self):
+        """ Remove all cached items and reset counters. """
+        self.data.clear()
+        self.root[:] = [self.root, self.root, None, None]
+        self.hits = self.misses = self.evictions = 0
+        return self
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.data), 'maxsize': self.maxsize}
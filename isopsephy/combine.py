@@ -0,0 +1,105 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: combine.py
+
+"""
+Combinations of distinct vocabulary words whose values add up to a target.
+
+list(find_combinations(text, 443)) -> [('ο', 'Λογος'), ...]
+find_combinations(text, 1000, k=3, max_results=20) -> generator of word triples
+
+Words are grouped by value first, so the searches loop over distinct values only and
+the words of each matching value combination are expanded at the end.
+"""
+
+from bisect import bisect_right
+from itertools import chain, combinations, groupby, islice, product
+from main import isopsephy_many
+
+def vocabulary_index(words, values = None):
+    """
+    Distinct words grouped by value: {value: [word, ...]}, words in the order of their
+    first appearance. Words is a list of words or a text string, values are calculated
+    with isopsephy_many unless given.
+    """
+    if isinstance(words, basestring):
+        words = words.split()
+    words = list(words)
+    if values is None:
+        values = isopsephy_many(words).tolist()
+    index, seen = {}, set()
+    for word, value in zip(words, values):
+        if word not in seen:
+            seen.add(word)
+            index.setdefault(value, []).append(word)
+    return index
+
+def find_combinations(words, num, k = 2, max_results = None, index = None):
+    """
+    Generate tuples of k distinct words whose values sum to num, every combination once,
+    words ordered by value. At most max_results tuples are generated if it is given. If index
+    from vocabulary_index is given, words are not indexed again.
+
+    k=2 looks up the complement of every value from the index, k=3 does the same for each
+    pair with the smallest value fixed, and k=4 meets in the middle: sums of the two smaller
+    values are indexed once and looked up for every pair of the two bigger ones.
+    """
+    if index is None:
+        index = vocabulary_index(words)
+    if k not in _searches:
+        raise ValueError("k must be from 1 to %s" % max(_searches))
+    matches = (combination for values in _searches[k](index, sorted(index), num)
+               for combination in _expand(index, values))
+    return islice(matches, max_results)
+
+def _expand(index, values):
+    """ Word combinations of a non-decreasing value combination, repeated values take distinct words """
+    groups = [(value, len(list(group))) for value, group in groupby(values)]
+    for parts in product(*[combinations(index[value], count) for value, count in groups]):
+        yield tuple(chain.from_iterable(parts))
+
+def _one(index, keys, num):
+    if num in index:
+        yield (num,)
+
+def _two(index, keys, num):
+    for a in keys:
+        if 2 * a > num:
+            break
+        if num - a in index:
+            yield (a, num - a)
+
+def _three(index, keys, num):
+    for i, a in enumerate(keys):
+        if 3 * a > num:
+            break
+        rest = num - a
+        for b in islice(keys, i, None):
+            if 2 * b > rest:
+                break
+            if rest - b in index:
+                yield (a, b, rest - b)
+
+def _four(index, keys, num):
+    # sum of the two smallest values a <= b -> b values in increasing order. Only pairs that
+    # leave room for two values of at least b are needed: a + b + 2 * b <= num
+    pairs = {}
+    for j, b in enumerate(keys):
+        if 3 * b > num:
+            break
+        for a in islice(keys, j + 1):
+            if a + 3 * b > num:
+                break
+            pairs.setdefault(a + b, []).append(b)
+    for j, c in enumerate(keys):
+        if 2 * c > num:
+            break
+        for d in islice(keys, j, None):
+            if c + d > num:
+                break
+            bs = pairs.get(num - c - d)
+            if bs:
+                for b in islice(bs, bisect_right(bs, c)):
+                    yield (num - c - d - b, b, c, d)
+
+_searches = {1: _one, 2: _two, 3: _three, 4: _four}
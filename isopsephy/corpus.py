@@ -0,0 +1,172 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: corpus.py
+
+"""
+Precomputed corpus file format (.isov) for zero-copy reloads.
+
+build_corpus('john.txt', 'john.isov')
+corpus = load_corpus('john.isov', 'john.txt')
+corpus.find(373) -> array([ 4,  7, 16])
+corpus.text(4, 6) -> 'Λογος και'
+
+File layout, all numbers little-endian:
+
+- header: magic 'ISOV', format version (uint32), number of tokens n (uint64), 16 reserved bytes
+- values: uint32 * n, isopsephy value of each token, padded to 8 bytes
+- starts: uint64 * n, byte offset of each token in the source text
+- ends: uint64 * n, byte offset right after each token in the source text
+- prefix: uint64 * (n+1), prefix sums of the values, starting from 0
+"""
+
+import mmap
+import os
+import re
+import shutil
+import struct
+import tempfile
+from itertools import islice
+import numpy as np
+from main import isopsephy_many, preprocess_greek
+
+MAGIC = 'ISOV'
+VERSION = 1
+header = struct.Struct('<4sIQ16x')
+regex_token = re.compile(r'\S+')
+
+class CorpusException(Exception):
+    pass
+
+def _layout(count):
+    """ Byte offsets of the values, starts, ends and prefix arrays for count tokens """
+    values = header.size
+    starts = values + 4 * count
+    starts += -starts % 8
+    ends = starts + 8 * count
+    prefix = ends + 8 * count
+    return values, starts, ends, prefix
+
+def build_corpus(source, path, sanitize = False, batch_size = 100000):
+    """
+    Tokenize utf-8 text file source on whitespace, calculate values of the tokens and write
+    them with token byte offsets and prefix sums to the corpus file path. Source is read
+    through mmap and processed in batches, so memory use doesn't depend on the file size.
+    If sanitize is True, tokens are preprocessed with preprocess_greek before calculation,
+    tokens without any letters left get the value 0. Returns the number of tokens.
+
+    Corpus is written to a temporary file next to path and renamed to path only when it is
+    complete, so a failed build never leaves a corpus file that looks valid.
+    """
+    fd, temp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            count = _write_corpus(source, out, sanitize, batch_size)
+        # mkstemp creates the file private to the user, give it the usual umask based mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp, 0666 & ~umask)
+        os.rename(temp, path)
+    except:
+        os.remove(temp)
+        raise
+    return count
+
+def _write_corpus(source, out, sanitize, batch_size):
+    """ See build_corpus """
+    count = 0
+    total = 0
+    with open(source, 'rb') as src:
+        out.write(header.pack(MAGIC, VERSION, 0))
+        # values go straight to the output, the other arrays wait in temporary files
+        sections = [tempfile.TemporaryFile() for i in range(3)]
+        sections[2].write(np.zeros(1, dtype='<u8').tobytes())
+        try:
+            text = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            text = ''
+        tokens = regex_token.finditer(text)
+        while True:
+            batch = [(m.group(), m.start(), m.end()) for m in islice(tokens, batch_size)]
+            if not batch:
+                break
+            words, starts, ends = zip(*batch)
+            if sanitize:
+                words = map(preprocess_greek, words)
+            values = isopsephy_many(words)
+            prefix = np.cumsum(values, dtype=np.uint64) + np.uint64(total)
+            out.write(values.astype('<u4').tobytes())
+            sections[0].write(np.array(starts, dtype='<u8').tobytes())
+            sections[1].write(np.array(ends, dtype='<u8').tobytes())
+            sections[2].write(prefix.astype('<u8').tobytes())
+            count += len(batch)
+            total = int(prefix[-1])
+        out.write('\0' * (_layout(count)[1] - out.tell()))
+        for section in sections:
+            section.seek(0)
+            shutil.copyfileobj(section, out)
+            section.close()
+        out.seek(0)
+        out.write(header.pack(MAGIC, VERSION, count))
+    return count
+
+class Corpus(object):
+    """
+    Memory mapped corpus file. Values, starts, ends and prefix are read-only numpy views
+    to the mapped file, so loading costs nothing and processes loading the same file
+    share the pages.
+    """
+    def __init__(self, path, source = None):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = header.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise CorpusException("File '%s' is not a version %s corpus file" % (path, VERSION))
+        offsets = _layout(count)
+        self.values = np.frombuffer(self.map, dtype='<u4', count=count, offset=offsets[0])
+        self.starts = np.frombuffer(self.map, dtype='<u8', count=count, offset=offsets[1])
+        self.ends = np.frombuffer(self.map, dtype='<u8', count=count, offset=offsets[2])
+        self.prefix = np.frombuffer(self.map, dtype='<u8', count=count+1, offset=offsets[3])
+        self.source = None
+        if source is not None:
+            with open(source, 'rb') as f:
+                self.source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.values)
+
+    def find(self, num):
+        """ Positions of the tokens with the value num """
+        return np.flatnonzero(self.values == num)
+
+    def find_cumulative(self, num):
+        """
+        Windows of consecutive tokens summing to num, as an array of (start, end) rows,
+        end being exclusive. Every window end is resolved with a binary search over the
+        prefix sums, so the search doesn't loop in python.
+        """
+        prefix = self.prefix
+        ends = np.flatnonzero(prefix[1:] >= num) + 1
+        wanted = prefix[ends] - np.uint64(num)
+        first = np.searchsorted(prefix, wanted, 'left')
+        last = np.minimum(np.searchsorted(prefix, wanted, 'right'), ends)
+        # zero valued tokens make equal prefix sums, so an end may have several starts
+        counts = np.maximum(last - first, 0)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.column_stack((np.repeat(first, counts) + offsets, np.repeat(ends, counts)))
+
+    def text(self, start, end):
+        """ Source text from the start of token start to the end of token end-1 """
+        if self.source is None:
+            raise CorpusException("Corpus was loaded without source text")
+        return self.source[int(self.starts[start]):int(self.ends[end-1])]
+
+    def close(self):
+        """ Close mapped files. Arrays must not be used after closing. """
+        self.map.close()
+        if self.source is not None:
+            self.source.close()
+
+def load_corpus(path, source = None):
+    """ Map corpus file to memory, optionally with the source text for text lookups """
+    return Corpus(path, source)
@@ -0,0 +1,104 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: engine.py
+
+import sys
+from itertools import imap
+
+# most common whitespace is part of the lookup table with zero value,
+# rarer unicode whitespace is stripped on a second, slower pass
+whitespace = dict.fromkeys(u' \t\n\r\x0b\x0c', 0)
+
+# batches are encoded to fixed width code units, narrow python builds use utf-16
+if sys.maxunicode > 0xffff:
+    codepoint_encoding, codepoint_dtype = 'utf-32-le', '<u4'
+else:
+    codepoint_encoding, codepoint_dtype = 'utf-16-le', '<u2'
+
+class Engine(object):
+    """
+    Compiled isopsephy calculator.
+
+    Letter to value mapping is flattened to a lookup table keyed by character, so the value
+    of a string is added up in one pass without building intermediate number strings.
+    Whitespace is ignored, any other character missing from the table (digits included)
+    raises the given exception.
+
+    engine = Engine({u'α': 1, u'β': 2}, ValueError, "unsupported characters in '%s'")
+    engine(u'αβ β') -> 5
+    engine.many([u'αβ', u'β']) -> array([3, 2])
+    """
+    def __init__(self, values, exception = ValueError, error_msg = "%s"):
+        # character -> value
+        self.values = dict(values)
+        self.lookup = dict(whitespace)
+        self.lookup.update(self.values)
+        self.exception = exception
+        self.error_msg = error_msg
+        self._array = None
+
+    def __call__(self, string):
+        """ String argument must be in unicode format. """
+        try:
+            return sum(imap(self.lookup.__getitem__, string))
+        except KeyError:
+            pass
+        try:
+            return sum(imap(self.lookup.__getitem__, u''.join(string.split())))
+        except KeyError:
+            raise self.exception(self.error_msg % string)
+
+
+    def array(self):
+        """
+        Codepoint indexed numpy lookup table. Unsupported characters are marked with -1,
+        the last item is always -1 so that bigger codepoints can be clipped to it.
+        """
+        if self._array is None:
+            import numpy as np
+            lookup = dict((ord(letter), value) for letter, value in self.lookup.items())
+            self._array = np.full(max(lookup) + 2, -1, dtype=np.int64)
+            self._array[lookup.keys()] = lookup.values()
+        return self._array
+
+    def many(self, words):
+        """
+        Values of a batch of words as an int64 numpy array. Words can be any iterable of
+        unicode or utf-8 strings, including numpy and pandas string arrays. Numpy is
+        imported on first use, so the single word path works with the standard library only.
+
+        All words are joined to one codepoint buffer separated by NUL characters, looked up
+        from the array table and added up per word with a segmented sum.
+        """
+        import numpy as np
+        words = list(words)
+        if not words:
+            return np.zeros(0, dtype=np.int64)
+        try:
+            joined = u'\x00'.join(words) if isinstance(words[0], unicode) else '\x00'.join(words)
+        except UnicodeDecodeError:
+            # mixed utf-8 and unicode strings
+            joined = u'\x00'.join(_unicode(word) for word in words)
+        codepoints = np.frombuffer(_unicode(joined).encode(codepoint_encoding), dtype=codepoint_dtype)
+        separators = np.flatnonzero(codepoints == 0)
+        if len(separators) != len(words) - 1:
+            # NUL inside of the words, let single word calculation report them
+            return np.array([self(_unicode(word)) for word in words], dtype=np.int64)
+        table = self.array()
+        values = table[np.minimum(codepoints, len(table) - 1)]
+        values[separators] = 0
+        invalid = values < 0
+        values[invalid] = 0
+        # every word owns its trailing zero valued separator, so empty words sum to zero
+        # and one extra zero keeps the index valid for an empty word at the end
+        starts = np.append(0, separators + 1)
+        result = np.add.reduceat(np.append(values, 0), starts)
+        # words with characters outside of the table either contain rarer whitespace
+        # or raise the same exception as a single word calculation would do
+        if invalid.any():
+            for idx in np.unique(np.searchsorted(starts, np.flatnonzero(invalid), 'right') - 1):
+                result[idx] = self(_unicode(words[idx]))
+        return result
+
+def _unicode(string):
+    return string if isinstance(string, unicode) else unicode(string, encoding="utf-8")
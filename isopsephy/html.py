@@ -3,41 +3,64 @@
 # file: html.py
 
 from IPython.display import HTML
+import numpy as np
 import pandas as pd
 from remarkuple import helper as h, table
 from math import digital_root, digital_sum
-from main import to_roman, to_greek, isopsephy, unicode_isopsephy
+from engine import codepoint_encoding, codepoint_dtype
+from main import to_roman, to_greek, isopsephy, unicode_isopsephy, engine
 
 def _init_text(text, capitalize = None):
     return text.decode('utf-8')
 
 def char_table_data(text, modulo = 9):
-    # initialize data dictionary, split text to columns: #, letter, translit, num, sum, mod, word
-    data = dict([key, []] for key in ['letter', 'transliteration', 'isopsephy', 'word'])
-    # character chart
-    # split words
-    for word in _init_text(text).split():
-        # split letters
-        for idx, letter in enumerate(word):
-            #data['index'].append(idx)
-            data['letter'].append(letter)
-            data['transliteration'].append(to_roman(letter.encode('utf-8')))
-            data['isopsephy'].append(isopsephy(letter.encode('utf-8')))
-            data['word'].append(word)
-
-    data = pd.DataFrame(data)
-    # word summary from character chart
-    gb = data.groupby('word')
-    data2 = gb.sum()
-    data2['characters'] = gb['word'].apply(len)
-    data2['digital_sum'] = data2['isopsephy'].apply(digital_sum)
-    data2['digital_root'] = data2['isopsephy'].apply(digital_root)
+    """
+    Letter, word and phrase summary data frames of the text.
+
+    Letters are handled as one codepoint array: values come from the engine lookup table
+    and transliterations are made once per distinct letter. Words are summarized by their
+    position in the text, so repeated words get their own rows.
+    """
+    words = _init_text(text).split()
+    joined = u''.join(words)
+    lengths = np.array([len(word) for word in words], dtype=np.int64)
+    # position of the word of each letter, and the letter range of each word
+    position = np.repeat(np.arange(len(words)), lengths)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    codepoints = np.frombuffer(joined.encode(codepoint_encoding), dtype=codepoint_dtype)
+    table = engine.array()
+    values = table[np.minimum(codepoints, len(table) - 1)]
+    invalid = np.flatnonzero(values < 0)
+    if len(invalid):
+        # let the single letter calculation raise its usual exception
+        unicode_isopsephy(joined[invalid[0]])
+    distinct, inverse = np.unique(codepoints, return_inverse=True)
+    letters = np.array([unichr(c) for c in distinct], dtype=object)
+    transliterations = np.array([to_roman(letter.encode('utf-8')) for letter in letters], dtype=object)
+    # letter chart
+    data = pd.DataFrame({'letter': letters[inverse],
+                         'transliteration': transliterations[inverse],
+                         'isopsephy': values,
+                         'word': np.array(words, dtype=object)[position],
+                         'position': position},
+                        columns=['letter', 'transliteration', 'isopsephy', 'word', 'position'])
+    # word summary from letter chart
+    prefix = np.append(0, np.cumsum(values))
+    sums = prefix[ends] - prefix[starts]
+    data2 = pd.DataFrame({'word': words,
+                          'isopsephy': sums,
+                          'characters': lengths,
+                          'digital_sum': digital_sum(sums),
+                          'digital_root': digital_root(sums, modulo)},
+                         columns=['word', 'isopsephy', 'characters', 'digital_sum', 'digital_root'])
+    data2.index.name = 'position'
     # phrase summary from word summary
-    s = data2.sum()
-    data3 = pd.DataFrame({'digital_root': [digital_root(s.isopsephy)],
-                          'characters': [s.characters], 
-                          'digital_sum': [digital_sum(s.isopsephy)],
-                          'isopsephy': [s.isopsephy],
+    total = int(prefix[-1])
+    data3 = pd.DataFrame({'digital_root': [digital_root(total, modulo)],
+                          'characters': [len(joined)],
+                          'digital_sum': [digital_sum(total)],
+                          'isopsephy': [total],
                           'phrase': text})
 
     return (data, data2, data3)
@@ -84,4 +107,74 @@ def char_table(text, modulo = 9):
     tbl.addFootRow(h.tr(h.td("%s %s" % (num, h.sub(digital_sum(num), " / ", digital_root(num, modulo))), 
                              colspan=len(text)+len(text.split()), 
                              style="border-top: solid 1px #ddd")))
-    return tbl
\ No newline at end of file
+    return tbl
+
+def _pages(text, words, lines):
+    """ Split text to page texts of the given number of words, or to non-empty lines """
+    if lines:
+        return [line for line in text.splitlines() if line.strip()]
+    tokens = text.split()
+    return [' '.join(tokens[start:start+words]) for start in range(0, len(tokens), words)]
+
+def char_table_pages(text, words = 20, lines = False, modulo = 9):
+    """
+    Generate char tables page by page, one table per given number of words, or one table
+    per non-empty line if lines is True. Tables are built only when they are requested.
+    """
+    for page in _pages(text, words, lines):
+        yield char_table(page, modulo)
+
+class CharTablePages(object):
+    """
+    Char tables of a long text split to pages. In IPython only the first page is rendered,
+    followed by a summary of the whole text. Other pages are built on demand:
+
+    pages = char_table_paged(text, words=20)
+    pages -> first page and summary
+    pages[3] -> fourth page
+    for page in pages: ... -> all pages one by one
+    """
+    def __init__(self, text, words = 20, lines = False, modulo = 9):
+        self.text = text
+        self.words = words
+        self.lines = lines
+        self.modulo = modulo
+        self.parts = _pages(text, words, lines)
+        self._first = None
+        self._summary = None
+
+    def __len__(self):
+        return len(self.parts)
+
+    def __getitem__(self, i):
+        if i == 0 or i == -len(self.parts):
+            return self.first()
+        return char_table(self.parts[i], self.modulo)
+
+    def __iter__(self):
+        for i in range(len(self.parts)):
+            yield self[i]
+
+    def first(self):
+        """ First page, built once and kept for redisplay """
+        if self._first is None:
+            self._first = char_table(self.parts[0] if self.parts else '', self.modulo)
+        return self._first
+
+    def summary(self):
+        """ Summary footer: pages, words and the isopsephy of the whole text """
+        if self._summary is None:
+            text = unicode(self.text, encoding="utf-8")
+            num = unicode_isopsephy(text)
+            self._summary = h.p("page 1 of %s, %s words, isopsephy %s %s" %
+                                (len(self.parts), len(text.split()), num,
+                                 h.sub(digital_sum(num), " / ", digital_root(num, self.modulo))),
+                                Class="char-table-summary")
+        return self._summary
+
+    def _repr_html_(self):
+        return str(self.first()) + str(self.summary())
+
+def char_table_paged(text, words = 20, lines = False, modulo = 9):
+    """ See CharTablePages """
+    return CharTablePages(text, words, lines, modulo)
\ No newline at end of file
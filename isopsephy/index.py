@@ -0,0 +1,71 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: index.py
+
+from bisect import bisect_left, bisect_right
+from main import isopsephy_many
+
+class ValueIndex(object):
+    """
+    Words of a text sorted by value for range, count and nearest value queries in
+    logarithmic time. Build once, query many times:
+
+    index = ValueIndex(text.split())
+    index.range(1000, 1100) -> [(position, word, value), ...] ordered by value
+    index.count(1000, 1100) -> number of words with values from 1000 to 1100
+    index.nearest(888, 20) -> 20 words closest to 888, closest first
+
+    Words is a list of words or a text string, values are calculated with isopsephy_many
+    unless given. With distinct=True only the first occurrence of each word is indexed.
+    """
+    def __init__(self, words, values = None, distinct = False):
+        if isinstance(words, basestring):
+            words = words.split()
+        self.words = words
+        if values is None:
+            values = isopsephy_many(words).tolist()
+        positions = range(len(words))
+        if distinct:
+            seen = set()
+            positions = [idx for idx in positions if not (words[idx] in seen or seen.add(words[idx]))]
+        # positions ordered by value, equal values in text order
+        self.positions = sorted(positions, key=values.__getitem__)
+        self.values = [values[idx] for idx in self.positions]
+
+    def __len__(self):
+        return len(self.values)
+
+    def _items(self, start, end):
+        return [(self.positions[i], self.words[self.positions[i]], self.values[i]) for i in xrange(start, end)]
+
+    def _bounds(self, low, high):
+        return bisect_left(self.values, low), bisect_right(self.values, high)
+
+    def count(self, low, high = None):
+        """ Number of words with values from low to high, both included. Without high, words with the value low. """
+        start, end = self._bounds(low, low if high is None else high)
+        return max(end - start, 0)
+
+    def range(self, low, high = None):
+        """ Words with values from low to high as (position, word, value) tuples ordered by value and position """
+        start, end = self._bounds(low, low if high is None else high)
+        return self._items(start, end)
+
+    def nearest(self, num, k = 1):
+        """
+        K words with values closest to num as (position, word, value) tuples, closest first.
+        On equal distance smaller values come first. Search starts from the binary search
+        position of num and grows to both directions, so only k items are visited.
+        """
+        values = self.values
+        right = bisect_left(values, num)
+        left = right - 1
+        result = []
+        while len(result) < k and (left >= 0 or right < len(values)):
+            if right >= len(values) or (left >= 0 and num - values[left] <= values[right] - num):
+                result.append(left)
+                left -= 1
+            else:
+                result.append(right)
+                right += 1
+        return [(self.positions[i], self.words[self.positions[i]], values[i]) for i in result]
@@ -0,0 +1,161 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: lexicon.py
+
+"""
+Persistent value lexicon of many texts in a SQLite file.
+
+lexicon = Lexicon('lexicon.db')
+lexicon.add_text('john', open('john.txt'))
+lexicon.find(373) -> [('λογος', 373, 3)]
+lexicon.find_range(370, 380) -> [('λογος', 373, 3), ...]
+lexicon.locations('λογος') -> [('john', 4), ('john', 7), ('john', 16)]
+
+Distinct words are stored once with their value and total number of occurrences, and
+every occurrence with the text and the word position in it, so value queries are answered
+from the indexes without reading the texts again. Words are utf-8 strings like elsewhere
+in the package.
+"""
+
+import sqlite3
+import sys
+from itertools import islice
+from main import unicode_isopsephy, preprocess_greek
+
+schema = """
+CREATE TABLE IF NOT EXISTS texts (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, words INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS words (id INTEGER PRIMARY KEY, word TEXT UNIQUE NOT NULL,
+                                  value INTEGER NOT NULL, count INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS occurrences (word INTEGER NOT NULL, text INTEGER NOT NULL, position INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS words_value ON words (value);
+CREATE INDEX IF NOT EXISTS occurrences_word ON occurrences (word);
+CREATE INDEX IF NOT EXISTS occurrences_text ON occurrences (text, position);
+"""
+
+# sqlite allows at most 999 parameters in one statement
+max_parameters = 500
+
+class LexiconException(Exception):
+    pass
+
+def _tokens(lines, sanitize):
+    """ Yield (position, word) of the words of the lines, skipping words emptied by preprocessing """
+    position = 0
+    for line in lines:
+        words = line.split()
+        if sanitize:
+            # spaces are kept by preprocessing, so words removed completely are left as empty strings
+            words = preprocess_greek(' '.join(words)).split(' ')
+        for word in words:
+            if word:
+                yield position, word
+            position += 1
+
+class Lexicon(object):
+    """
+    SQLite backed word value lexicon. File is created if it doesn't exist yet.
+    """
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        # words go in and come out as utf-8 strings
+        self.connection.text_factory = str
+        self.connection.executescript(schema)
+        # word -> id of the words already in the lexicon, filled while adding texts
+        self.ids = {}
+
+    def add_text(self, name, lines, sanitize = True, batch_size = 100000):
+        """
+        Add words of a text to the lexicon. Lines is a utf-8 string or any iterable of utf-8
+        lines, like an open file. If sanitize is True, words are preprocessed with preprocess_greek
+        and words without any letters left are skipped. Positions are word positions in the
+        original text in either case. Words are inserted in one transaction per batch_size words.
+        If adding fails or is interrupted, batches already added are removed again with
+        remove_text, so the text can be added again. Returns the number of words added.
+        """
+        if isinstance(lines, basestring):
+            lines = [lines]
+        with self.connection:
+            try:
+                text = self.connection.execute("INSERT INTO texts (name, words) VALUES (?, 0)", (name,)).lastrowid
+            except sqlite3.IntegrityError:
+                raise LexiconException("Text '%s' is already in the lexicon" % name)
+        tokens = _tokens(lines, sanitize)
+        count = 0
+        try:
+            while True:
+                batch = list(islice(tokens, batch_size))
+                if not batch:
+                    break
+                with self.connection:
+                    self._add_batch(text, batch)
+                    count += len(batch)
+                    self.connection.execute("UPDATE texts SET words = ? WHERE id = ?", (count, text))
+        except:
+            error = sys.exc_info()
+            self.remove_text(name)
+            raise error[0], error[1], error[2]
+        return count
+
+    def remove_text(self, name):
+        """ Remove a text, its occurrences and words that don't occur in other texts. Returns True if the text was found. """
+        row = self.connection.execute("SELECT id FROM texts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return False
+        with self.connection:
+            counts = self.connection.execute("SELECT COUNT(*), word FROM occurrences WHERE text = ? GROUP BY word",
+                                             (row[0],)).fetchall()
+            self.connection.executemany("UPDATE words SET count = count - ? WHERE id = ?", counts)
+            self.connection.execute("DELETE FROM occurrences WHERE text = ?", (row[0],))
+            self.connection.execute("DELETE FROM words WHERE count <= 0")
+            self.connection.execute("DELETE FROM texts WHERE id = ?", (row[0],))
+        # ids of removed words, and of words of an interrupted batch, can't be trusted any more
+        self.ids.clear()
+        return True
+
+    def _add_batch(self, text, batch):
+        """ Insert new words, update counts and add occurrences of a batch of (position, word) """
+        counts = {}
+        for position, word in batch:
+            counts[word] = counts.get(word, 0) + 1
+        ids = self.ids
+        missing = [word for word in counts if word not in ids]
+        self.connection.executemany("INSERT OR IGNORE INTO words (word, value, count) VALUES (?, ?, 0)",
+                                    [(word, unicode_isopsephy(word.decode('utf-8'))) for word in missing])
+        for start in range(0, len(missing), max_parameters):
+            chunk = missing[start:start+max_parameters]
+            ids.update((word, id) for id, word in self.connection.execute(
+                "SELECT id, word FROM words WHERE word IN (%s)" % ','.join('?' * len(chunk)), chunk))
+        self.connection.executemany("UPDATE words SET count = count + ? WHERE id = ?",
+                                    [(n, ids[word]) for word, n in counts.iteritems()])
+        self.connection.executemany("INSERT INTO occurrences (word, text, position) VALUES (?, ?, ?)",
+                                    [(ids[word], text, position) for position, word in batch])
+
+    def find(self, num):
+        """ Words with the value num as (word, value, count) tuples """
+        return self.connection.execute("SELECT word, value, count FROM words WHERE value = ? ORDER BY word",
+                                       (num,)).fetchall()
+
+    def find_range(self, low, high):
+        """ Words with values from low to high, both included, as (word, value, count) tuples ordered by value """
+        return self.connection.execute("SELECT word, value, count FROM words WHERE value BETWEEN ? AND ? "
+                                       "ORDER BY value, word", (low, high)).fetchall()
+
+    def value(self, word):
+        """ Value of the word, None if the word is not in the lexicon """
+        row = self.connection.execute("SELECT value FROM words WHERE word = ?", (word,)).fetchone()
+        return row[0] if row else None
+
+    def locations(self, word):
+        """ Occurrences of the word as (text name, position) tuples """
+        return self.connection.execute("SELECT texts.name, occurrences.position FROM words "
+                                       "JOIN occurrences ON occurrences.word = words.id "
+                                       "JOIN texts ON texts.id = occurrences.text "
+                                       "WHERE words.word = ? ORDER BY texts.id, occurrences.position",
+                                       (word,)).fetchall()
+
+    def texts(self):
+        """ Texts in the lexicon as (name, number of words) tuples """
+        return self.connection.execute("SELECT name, words FROM texts ORDER BY id").fetchall()
+
+    def close(self):
+        self.connection.close()
@@ -2,9 +2,11 @@
 # -*- coding: utf-8 -*-
 # file: main.py
 
-import re
-import pandas as pd
+from collections import deque
+from itertools import islice, izip
 import search
+from cache import LRUCache
+from engine import Engine
 from romanize import el
 
 data = el.data
@@ -59,13 +61,35 @@ for num, d in data.items():
     # roman capital letter value
     greek_roman_values[d['roman'].upper()] = num
 
-regex_greek_roman_values = re.compile('|'.join(greek_roman_values.keys()))
-regex_has_numbers = re.compile('\d')
 isopsephy_error_msg = "String '%s' contains unsupported characters for isopsephy calculation"
 
 class IsopsephyException(Exception):
     pass
 
+engine = Engine(greek_roman_values, IsopsephyException, isopsephy_error_msg)
+
+# opt-in memoization of the most common words, disabled until set_cache_size is called
+caches = {'isopsephy': LRUCache(engine),
+          'convert': LRUCache(el.convert),
+          'preprocess': LRUCache(el.preprocess)}
+
+def set_cache_size(maxsize):
+    """
+    Enable memoization of word values, transliteration and preprocessing with at most
+    maxsize items per cache. Maxsize 0 disables caches. Can be changed at runtime,
+    shrinking evicts the least recently used items.
+    """
+    for cache in caches.values():
+        cache.resize(maxsize)
+
+def clear_cache():
+    for cache in caches.values():
+        cache.clear()
+
+def cache_info():
+    """ Hit, miss and eviction counters, current and maximum size of each cache """
+    return dict((name, cache.info()) for name, cache in caches.items())
+
 def isopsephy(string):
     """
     String is a greek letter, word or sentence OR roman letter representation (transliteration) 
@@ -77,41 +101,120 @@ def isopsephy(string):
 
 def unicode_isopsephy(string):
     """
-    String argument must be in unicode format.
+    String argument must be in unicode format. Digits and other unsupported characters
+    raise IsopsephyException, whitespace is ignored.
     """
-    result = 0
-    # don't accept strings that contain numbers
-    if regex_has_numbers.search(string):
-        raise IsopsephyException(isopsephy_error_msg % string)
-    else:
-        num_str = regex_greek_roman_values.sub(lambda x: '%s ' % greek_roman_values[x.group()],
-                                               string)
-        # don't accept strings, that contains letters which haven't been be converted to numbers
-        try:
-            result = sum([int(i) for i in num_str.split()])
-        except Exception as e:
-            raise IsopsephyException(isopsephy_error_msg % string)
-    return result
+    return caches['isopsephy'](string)
+
+def isopsephy_many(words):
+    """
+    Vectorized isopsephy for a batch of words. Words can be a list, a generator or a numpy/pandas
+    string array of utf-8 or unicode strings. Returns an int64 numpy array of the values in the same order.
+    """
+    return engine.many(words)
 
 def to_roman(word):
-    return el.convert(word)
+    return caches['convert'](word)
 
 def to_greek(word):
-    return el.convert(word)
+    return caches['convert'](word)
 
 def preprocess_roman(string):
-    return el.preprocess(string)
+    return caches['preprocess'](string)
 
 def preprocess_greek(string):
-    return el.preprocess(string)
+    return caches['preprocess'](string)
 
 def find(text, num, cumulative = False):
     words = text.split()
-    numbers = list(map(isopsephy, words))
+    numbers = isopsephy_many(words).tolist()
     if cumulative:
         result = []
         for incides in search.find_cumulative_indices(numbers, num):
             result.append(' '.join([words[idx] for idx in incides]))
         return result
     else:
-        return [words[idx] for idx in map(numbers.index, numbers) if numbers[idx] == num]
+        return [words[idx] for idx in search.find_value_indices(numbers, num)]
+
+def find_cumulative_many(text_or_values, targets):
+    """
+    Cumulative find for many target sums at once. Word values are calculated and scanned
+    only once instead of once per target. Argument is either a text or a list of already
+    calculated values. Results are grouped by target, as phrases for a text and as
+    (start, end) tuples for values.
+    """
+    if isinstance(text_or_values, basestring):
+        words = text_or_values.split()
+        found = search.find_cumulative_indices_many(isopsephy_many(words).tolist(), targets)
+        return dict((target, [' '.join(words[start:end]) for start, end in spans])
+                    for target, spans in found.items())
+    return search.find_cumulative_indices_many(text_or_values, targets)
+
+def index_words(words):
+    """
+    Map each isopsephy value to the positions of the words having it. Prebuilt index
+    makes repeated find_positions queries against the same words cost only the matches.
+    """
+    return search.index_values(isopsephy_many(words).tolist())
+
+def find_positions(text, num, index = None):
+    """
+    Find every word with the isopsephy value num and return them as (position, word) tuples.
+    Text is either a string or a list of already split words. If index from index_words
+    is given, word values are not calculated again. Give words as a list in that case
+    to avoid splitting the text on every query.
+    """
+    words = text.split() if isinstance(text, basestring) else text
+    numbers = None if index is not None else isopsephy_many(words).tolist()
+    return [(idx, words[idx]) for idx in search.find_value_indices(numbers, num, index)]
+
+
+def find_subsets(text, num, span):
+    """
+    Find words with the total isopsephy value num within span consecutive words, gaps allowed.
+    Returns one match for every word that starts a match, as (positions, phrase) tuples.
+    """
+    words = text.split() if isinstance(text, basestring) else text
+    return [(positions, ' '.join(words[idx] for idx in positions))
+            for positions in search.find_subset_indices(isopsephy_many(words).tolist(), num, span)]
+
+def iter_word_values(lines, chunk_size = 65536):
+    """
+    Split utf-8 text to words and yield (word, value) tuples. Lines is either a file-like
+    object, for example an open file or sys.stdin, or any iterable of lines.
+
+    File-like objects are read chunk_size bytes at a time, and a word cut at the end of a
+    chunk is completed from the next one, so memory use doesn't depend on the length of the
+    lines. Items of other iterables are whole lines, so words never continue from one item
+    to the next. Values are calculated in batches, one per chunk or line.
+    """
+    if not hasattr(lines, 'read'):
+        for line in lines:
+            words = line.split()
+            for pair in izip(words, isopsephy_many(words).tolist()):
+                yield pair
+        return
+    partial = ''
+    for chunk in iter(lambda: lines.read(chunk_size), ''):
+        words = (partial + chunk).split()
+        # utf-8 multibyte sequences never contain ascii whitespace, so splitting bytes is safe
+        partial = words.pop() if words and not chunk[-1].isspace() else ''
+        for pair in izip(words, isopsephy_many(words).tolist()):
+            yield pair
+    if partial:
+        yield partial, isopsephy_many([partial]).tolist()[0]
+
+def find_cumulative_stream(lines, num, chunk_size = 65536):
+    """
+    Streaming cumulative find for files and pipes. Lines is a file-like object or an iterable
+    of utf-8 lines as in iter_word_values, and matches are yielded as (start, end, phrase)
+    tuples as soon as they are found. Memory use stays constant, because files are read in
+    chunks and only the words of the current window are kept.
+    """
+    # every word has a value of at least one, so a matching window can't be longer than num
+    recent = deque(maxlen=max(num, 1))
+    def value(pair):
+        recent.append(pair[0])
+        return pair[1]
+    for start, end in search.iter_cumulative_indices(iter_word_values(lines, chunk_size), num, value):
+        yield (start, end, ' '.join(islice(recent, len(recent) - (end - start), None)))
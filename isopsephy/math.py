@@ -2,17 +2,66 @@
 # -*- coding: utf-8 -*-
 # file: math.py
 
+# Functions below work on single numbers and on numpy integer arrays alike,
+# using only arithmetic operators, so numpy is not needed to import them
+
 def digital_root(num, modulo = 9):
-    """ similar to modulo, but 0 and 9 are taken as 9 """
+    """
+    similar to modulo, but 0 and 9 are taken as 9. With a sequence of moduli,
+    a tuple of digital roots is returned: digital_root(373, (7, 9)) -> (2, 4)
+    """
+    if isinstance(modulo, (tuple, list)):
+        return tuple(digital_root(num, m) for m in modulo)
     val = num % modulo
-    return val if val > 0 else modulo
+    return val + modulo * (val == 0)
 
 def digital_sum(num):
-    return sum(prepare_digital_operation(num))
+    """ sum of the digits of the number: 373 -> 13 """
+    if _is_float(num):
+        return _each(num, lambda x: sum(prepare_digital_operation(x)))
+    num, total = abs(num), num * 0
+    while _any(num):
+        num, digit = divmod(num, 10)
+        total += digit
+    return total
 
 def digital_product(num):
-    return reduce(lambda x, y: x * y, prepare_digital_operation(num), 1)
+    """ product of the non-zero digits of the number: 307 -> 21 """
+    if _is_float(num):
+        return _each(num, lambda x: reduce(lambda x, y: x * y, prepare_digital_operation(x), 1))
+    num, product = abs(num), num * 0 + 1
+    while _any(num):
+        num, digit = divmod(num, 10)
+        product *= digit + (digit == 0)
+    return product
+
+def digital_root_summary(values, moduli = (9,)):
+    """
+    Count digital roots of an array of values for each modulo in one pass per modulo.
+    Returns {modulo: counts}, counts[r] being the number of values with the digital root r,
+    counts[0] is always 0.
+
+    digital_root_summary([373, 443, 9], (9,)) -> {9: array([0, 0, 1, 0, 1, 0, 0, 0, 0, 1])}
+    """
+    import numpy as np
+    values = np.asarray(values, dtype=np.int64)
+    return dict((modulo, np.bincount(digital_root(values, modulo), minlength=modulo+1)) for modulo in moduli)
 
 def prepare_digital_operation(num):
     """ strip off 0|,|. and return a list of single digit integers from original number """
-    return map(int, str(num).replace('0', '').replace('.', '').replace(',', ''))
\ No newline at end of file
+    return map(int, str(num).replace('0', '').replace('.', '').replace(',', ''))
+
+def _any(num):
+    """ truth value of a number, or whether any number of an array is non-zero """
+    return num.any() if hasattr(num, 'any') else num
+
+def _is_float(num):
+    """ whether num is a float or an array of floats, which don't work with divmod digits """
+    return isinstance(num, float) or getattr(getattr(num, 'dtype', None), 'kind', None) == 'f'
+
+def _each(num, function):
+    """ apply a digit string function to a float, or to each float of an array """
+    if isinstance(num, float):
+        return function(num)
+    import numpy as np
+    return np.array([function(x) for x in num.flat], dtype=np.int64).reshape(num.shape)
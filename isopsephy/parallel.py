@@ -0,0 +1,151 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+# file: parallel.py
+
+"""
+Parallel scanner for large utf-8 text files.
+
+File is split to byte ranges, word values and exact and cumulative searches are done
+for every range in a separate process and the results are merged in file order.
+
+scan('corpus.txt', exact=[373], cumulative=[443, 1000], processes=32) ->
+{'words': 1234567,
+ 'exact': {373: [(4, 'Λογος'), ...]},
+ 'cumulative': {443: [(6, 8, 'Λογος και'), ...], 1000: [...]}}
+"""
+
+import os
+import re
+from multiprocessing import Pool, cpu_count
+import search
+from main import isopsephy_many, preprocess_greek
+
+regex_whitespace = re.compile(r'\s')
+
+def shard_ranges(path, shards):
+    """
+    Split file to about equal (start, end) byte ranges. Every boundary is moved forward
+    to the next ascii whitespace byte. Bytes of multibyte utf-8 sequences are never
+    ascii, so boundaries are aligned to both words and codepoints.
+    """
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for k in range(1, shards):
+            pos = max(size * k // shards, bounds[-1])
+            f.seek(pos)
+            while True:
+                chunk = f.read(4096)
+                if not chunk:
+                    pos = size
+                    break
+                match = regex_whitespace.search(chunk)
+                if match:
+                    pos += match.start()
+                    break
+                pos += len(chunk)
+            bounds.append(pos)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+def _edges(words, values, limit):
+    """
+    Longest prefix and suffix of the shard which sum below the limit, as lists of
+    (position, word, value). These are the only parts of the shard that a window
+    crossing the shard boundaries can cover. If the whole shard sums below limit,
+    None is returned for both.
+    """
+    if sum(values) < limit:
+        return None, None
+    y, head = 0, 0
+    while y + values[head] < limit:
+        y += values[head]
+        head += 1
+    y, tail = 0, len(values)
+    while y + values[tail-1] < limit:
+        y += values[tail-1]
+        tail -= 1
+    return ([(idx, words[idx], values[idx]) for idx in range(head)],
+            [(idx, words[idx], values[idx]) for idx in range(tail, len(values))])
+
+def _scan_shard(args):
+    """ Worker: search one byte range of the file with positions local to the range. """
+    path, start, end, exact, cumulative, sanitize = args
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start)
+    if sanitize:
+        # newlines are turned to spaces first, so that preprocessing doesn't join words
+        text = preprocess_greek(' '.join(text.split()))
+    words = text.split()
+    values = isopsephy_many(words).tolist()
+    result = {'words': len(words), 'head': None, 'tail': None}
+    result['exact'] = dict((num, [(idx, words[idx]) for idx in search.find_value_indices(values, num)])
+                           for num in exact)
+    result['cumulative'] = dict((num, [(u, v, ' '.join(words[u:v])) for u, v in spans])
+                                for num, spans in search.find_cumulative_indices_many(values, cumulative).items())
+    if cumulative:
+        result['head'], result['tail'] = _edges(words, values, max(cumulative))
+        if result['head'] is None:
+            result['whole'] = [(idx, words[idx], values[idx]) for idx in range(len(words))]
+    return result
+
+def _stitch(run, cumulative, found):
+    """ Search a run of tokens around shard boundaries, keep only windows crossing a boundary. """
+    if not run:
+        return
+    matches = search.find_cumulative_indices_many([val for pos, shard, word, val in run], cumulative)
+    for num, spans in matches.items():
+        for u, v in spans:
+            if run[u][1] != run[v-1][1]:
+                found[num].append((run[u][0], run[v-1][0]+1, ' '.join(word for pos, shard, word, val in run[u:v])))
+
+def scan(path, exact = (), cumulative = (), processes = None, shards = None, sanitize = False):
+    """
+    Calculate word values of a utf-8 text file and find words with exact values and
+    phrases with cumulative values in parallel.
+
+    Processes defaults to the number of cpus and shards to four times the processes for
+    even load. If sanitize is True, shards are preprocessed with preprocess_greek first.
+    With one process everything is done in the current process.
+
+    Returns total number of words, exact matches as (position, word) and cumulative
+    matches as (start, end, phrase) tuples, both grouped by the target value and ordered
+    by position.
+    """
+    exact, cumulative = list(exact), list(cumulative)
+    processes = processes or cpu_count()
+    ranges = shard_ranges(path, shards or processes * 4)
+    tasks = [(path, start, end, exact, cumulative, sanitize) for start, end in ranges]
+    if processes > 1:
+        pool = Pool(processes)
+        try:
+            shards = pool.map(_scan_shard, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        shards = map(_scan_shard, tasks)
+    result = {'words': 0,
+              'exact': dict((num, []) for num in exact),
+              'cumulative': dict((num, []) for num in cumulative)}
+    # tokens of the current run of shard edges: (global position, shard, word, value)
+    run = []
+    for idx, shard in enumerate(shards):
+        offset = result['words']
+        for num, matches in shard['exact'].items():
+            result['exact'][num].extend((offset + pos, word) for pos, word in matches)
+        for num, matches in shard['cumulative'].items():
+            result['cumulative'][num].extend((offset + u, offset + v, phrase) for u, v, phrase in matches)
+        if cumulative:
+            if shard['head'] is None:
+                run.extend((offset + pos, idx, word, val) for pos, word, val in shard['whole'])
+            else:
+                run.extend((offset + pos, idx, word, val) for pos, word, val in shard['head'])
+                _stitch(run, cumulative, result['cumulative'])
+                run = [(offset + pos, idx, word, val) for pos, word, val in shard['tail']]
+        result['words'] += shard['words']
+    _stitch(run, cumulative, result['cumulative'])
+    for matches in result['cumulative'].values():
+        matches.sort()
+    return result
@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 # file: search.py
 
+from bisect import bisect_left, bisect_right
+from collections import deque
+
 def find_cumulative_indices(list_of_numbers, search_sum):
     """ 
     find_cumulative_indices([70, 58, 81, 909, 70, 215, 70, 1022, 580, 930, 898], 285) ->
@@ -21,6 +24,212 @@ def find_cumulative_indices(list_of_numbers, search_sum):
     # for easier cell data handling on pandas dataframe
     return result or ''
 
+def iter_cumulative_indices(iterable, search_sum, value = None):
+    """
+    Streaming version of find_cumulative_indices for unbounded iterables. Only the current
+    window is kept in memory and every match is yielded as soon as it is found as a
+    (start, end) tuple, end being exclusive.
+
+    list(iter_cumulative_indices([70, 58, 81, 909, 70, 215, 70, 1022, 580, 930, 898], 285)) ->
+    [(4, 6), (5, 7)]
+
+    If value function is given, items are converted to numbers with it, for example words
+    with isopsephy.
+    """
+    window = deque()
+    u = 0
+    y = 0
+    for idx, item in enumerate(iterable):
+        val = value(item) if value else item
+        window.append(val)
+        y += val
+        while y >= search_sum and window:
+            if y == search_sum:
+                yield (u, idx+1)
+            y -= window.popleft()
+            u += 1
+
+def find_cumulative_indices_many(list_of_numbers, targets):
+    """
+    Find windows of consecutive numbers summing to any of the targets in a single pass.
+    Matches are grouped by target as (start, end) tuples, end being exclusive.
+
+    find_cumulative_indices_many([70, 58, 81, 909, 70, 215, 70], [285, 139]) ->
+    {285: [(4, 6), (5, 7)], 139: [(1, 3)]}
+
+    Prefix sums are built once. For each window end the starting points are looked up
+    either from the hash of seen prefix sums, one lookup per target, or by walking the
+    few prefix sums that can fall between the smallest and the biggest target, whichever
+    is less work. Numbers must not be negative.
+    """
+    targets = set(targets)
+    result = dict((target, []) for target in targets)
+    if not targets:
+        return result
+    low, high = min(targets), max(targets)
+    # prefix sums in order and prefix sum -> positions
+    prefixes = [0]
+    seen = {0: [0]}
+    y = 0
+    for idx, val in enumerate(list_of_numbers):
+        y += val
+        first = bisect_left(prefixes, y - high)
+        last = bisect_right(prefixes, y - low)
+        if last - first < len(targets):
+            for start in range(first, last):
+                if y - prefixes[start] in targets:
+                    result[y - prefixes[start]].append((start, idx+1))
+        else:
+            for target in targets:
+                for start in seen.get(y - target, ()):
+                    result[target].append((start, idx+1))
+        prefixes.append(y)
+        seen.setdefault(y, []).append(idx+1)
+    return result
+
+def find_cumulative_indices_near(list_of_numbers, search_sum, tolerance = 0, max_length = None):
+    """
+    Find windows of consecutive numbers summing to search_sum give or take tolerance,
+    as (start, end) tuples ordered by end, end being exclusive.
+
+    find_cumulative_indices_near([70, 58, 81, 909, 70, 215, 70], 285, 5) ->
+    [(4, 6), (5, 7)]
+    find_cumulative_indices_near([70, 58, 81, 909, 70, 215, 70], 215, 70, 1) ->
+    [(5, 6)]
+
+    Prefix sums never decrease, so for each window end the matching starts form one run,
+    which is tracked with two pointers that only move forward. Max_length limits the number
+    of numbers in a window. Numbers must not be negative.
+    """
+    low, high = search_sum - tolerance, search_sum + tolerance
+    prefixes = [0]
+    # starts from first to last-1 have sums between low and high for the current end
+    first = last = 0
+    y = 0
+    result = []
+    for idx, val in enumerate(list_of_numbers):
+        y += val
+        prefixes.append(y)
+        while first <= idx and prefixes[first] < y - high:
+            first += 1
+        while last <= idx and prefixes[last] <= y - low:
+            last += 1
+        start = first if max_length is None else max(first, idx + 1 - max_length)
+        result.extend((u, idx+1) for u in xrange(start, last))
+    return result
+
+def find_cumulative_indices_root(list_of_numbers, search_sum, modulo = 9, max_length = None):
+    """
+    Find windows of consecutive numbers whose sum has the same digital root as search_sum,
+    as (start, end) tuples ordered by end, end being exclusive.
+
+    find_cumulative_indices_root([70, 58, 81, 909], 9, 9, 2) ->
+    [(2, 3), (2, 4), (3, 4)]
+
+    A window sum matches when the prefix sums at its ends differ by search_sum modulo,
+    so starting positions are grouped by prefix sum residue and every window end looks up
+    its group directly. Long texts have lots of matches, max_length limits the number of
+    numbers in a window.
+    """
+    residue = search_sum % modulo
+    # prefix sum residue -> starting positions in order
+    starts = {0: [0]}
+    y = 0
+    result = []
+    for idx, val in enumerate(list_of_numbers):
+        y = (y + val) % modulo
+        candidates = starts.get((y - residue) % modulo, ())
+        first = 0 if max_length is None else bisect_left(candidates, idx + 1 - max_length)
+        result.extend((candidates[i], idx+1) for i in xrange(first, len(candidates)))
+        starts.setdefault(y, []).append(idx+1)
+    return result
+
+def find_subset_indices(list_of_numbers, search_sum, span):
+    """
+    Find words that sum to search_sum within a span of consecutive numbers, not necessarily
+    next to each other. For each starting position that begins such a subset, one subset is
+    returned as a tuple of positions.
+
+    find_subset_indices([70, 58, 81, 909, 70, 215, 70], 355, 3) ->
+    [(4, 5, 6)]
+    find_subset_indices([70, 58, 81, 909, 70, 215, 70], 151, 3) ->
+    [(0, 2), (2, 4)]
+
+    Sums reachable with the numbers after the start are kept as bits of python integers,
+    bit s being set when some subset sums to s. The window slides with a queue built of two
+    stacks: the back stack is updated in place when a number enters, the front stack holds
+    the reachable sums of each suffix and is rebuilt from the back stack only when it runs
+    empty, so every number is added to a bitset a constant number of times. The back sums
+    are kept bit reversed, which turns the question whether front and back together reach
+    the target into a single shift and and. Numbers must not be negative.
+    """
+    numbers = list_of_numbers if isinstance(list_of_numbers, list) else list(list_of_numbers)
+    n = len(numbers)
+    if search_sum < 0 or span < 1:
+        return []
+    mask = (1 << (search_sum + 1)) - 1
+    # back stack: bit j of reverse is set when some subset of the back numbers sums to search_sum - j
+    back = []
+    reverse = 1 << search_sum
+    # front stack: (position, reachable sums of this number and all newer ones in the front)
+    front = []
+    result = []
+    for idx in xrange(1, min(span, n)):
+        back.append(idx)
+        reverse |= reverse >> numbers[idx]
+    for idx in xrange(n):
+        if not front and back:
+            reachable = 1
+            for pos in reversed(back):
+                reachable = (reachable | reachable << numbers[pos]) & mask
+                front.append((pos, reachable))
+            back, reverse = [], 1 << search_sum
+        reachable = front[-1][1] if front else 1
+        val = numbers[idx]
+        if val <= search_sum and (reachable << val) & reverse:
+            result.append((idx,) + _subset(numbers, range(idx+1, min(idx+span, n)), search_sum - val, mask))
+        # slide the window: the next start leaves, the number span positions after it enters
+        if front:
+            front.pop()
+        if span > 1 and idx + span < n:
+            back.append(idx + span)
+            reverse |= reverse >> numbers[idx + span]
+    return result
+
+def _subset(numbers, positions, search_sum, mask):
+    """ One subset of the numbers at positions summing to search_sum, which must be reachable """
+    reachable = [1]
+    for pos in positions:
+        reachable.append((reachable[-1] | reachable[-1] << numbers[pos]) & mask)
+    subset = []
+    for k in xrange(len(positions), 0, -1):
+        if not reachable[k-1] >> search_sum & 1:
+            subset.append(positions[k-1])
+            search_sum -= numbers[positions[k-1]]
+    return tuple(reversed(subset))
+
+def index_values(list_of_numbers):
+    """
+    index_values([70, 58, 70, 215]) ->
+    {70: [0, 2], 58: [1], 215: [3]}
+    """
+    index = {}
+    for idx, val in enumerate(list_of_numbers):
+        index.setdefault(val, []).append(idx)
+    return index
+
+def find_value_indices(list_of_numbers, search_value, index = None):
+    """
+    find_value_indices([70, 58, 81, 909, 70, 215], 70) ->
+    [0, 4]
+
+    If index prebuilt by index_values is given, list_of_numbers is not scanned at all
+    and the cost of the query depends only on the number of matches.
+    """
+    if index is not None:
+        return list(index.get(search_value, []))
+    return [idx for idx, val in enumerate(list_of_numbers) if val == search_value]
+
 # http://stackoverflow.com/questions/21380268/matching-the-sum-of-values-on-string
 
 def search_by_num(text, num):
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # file: main.py
 
-RESERVED_TAG_METHODS = ["setAttribute", "getAttribute", "addContent"]
+RESERVED_TAG_METHODS = ["setAttribute", "getAttribute", "addContent", "changed"]
 
 class TAGAttributeError(Exception):
     pass
@@ -38,30 +38,43 @@ class TAG(object):
     
     print a, b -> <a href="#"><span>text</span></a> <b class="extra-bold">text</b>
     
+    Or stream it without building the whole string:
+    
+    a.write_to(open("a.html", "w"))
+    
+    Rendering doesn't change the tag, and the string is cached until the tag or any tag inside
+    it is changed again, so printing or displaying the same tag twice costs nothing. Content must
+    be changed with the methods above, not by editing tag.content directly, for the cache to notice.
+    
     """
+    # content, attributes, version and the cached rendering are kept in slots instead of a per
+    # instance __dict__. Extended tags like table and svg don't define slots, so they still get a __dict__
+    __slots__ = ('content', 'attributes', '_version', '_cache')
+
     def __init__(self, *args, **kw):
         """ Args as inner html content, kw as tag attributes. Attributes names/keys are all transformed to lower letters! """
-        self.__dict__['content'] = []
-        self.__dict__['attributes'] = {}
-        for arg in args:
-            self.__dict__['content'].append(arg)
-        for key, val in kw.iteritems():
-            self.__dict__['attributes'][key.lower()] = val
+        object.__setattr__(self, 'content', list(args))
+        object.__setattr__(self, 'attributes', dict((key.lower(), val) for key, val in kw.iteritems()))
+        # version is increased on every change of the tag itself
+        object.__setattr__(self, '_version', 0)
+        # (tags rendered, their versions at the time, html)
+        object.__setattr__(self, '_cache', None)
     
     def getAttribute(self, key):
         """ Get attribute by key in case-sensitive manner. Returning None if attribute is not found. """
-        return self.__dict__['attributes'].get(key, None)
+        return self.attributes.get(key, None)
     def __getattr__(self, key):
         """ 
         Get attribute by key by dot notation: tag.attr. This is a short and nice way, but
         drawback is that python has some reserved words, that can't be used this way. Method is also
         not-case-sensitive, because key is transformed to lower letters. Returning None if attribute is not found. 
         """
-        return self.__dict__['attributes'].get(key.lower(), None)
+        return self.attributes.get(key.lower(), None)
     
     def setAttribute(self, key, val):
         """ Set attribute by key and value in case-sensitive manner. Returning self object for chaining methods. """
-        self.__dict__['attributes'][key] = val
+        self.attributes[key] = val
+        self.changed()
         return self
     def __setattr__(self, key, val):
         """ 
@@ -70,7 +83,8 @@ class TAG(object):
         not-case-sensitive, because key is transformed to lower letters. 
         """
         if key not in RESERVED_TAG_METHODS:
-            self.__dict__['attributes'][key.lower()] = val
+            self.attributes[key.lower()] = val
+            self.changed()
         else:
             raise TAGAttributeError('Cannot use %s.%s="%s" notation due to conflicting attributes with builtin tag method names. Use %s.setAttribute("%s", "%s") instead.' % 
                                     (self.__class__.__name__, key, val, self.__class__.__name__, key, val))
@@ -81,29 +95,124 @@ class TAG(object):
         return self.__iadd__(item)
     def __iadd__(self, item):
         """ Plus notation for adding content for tag: tag1 += tag2. """
-        self.__dict__['content'].append(item)
+        self.content.append(item)
+        self.changed()
         return self
     
     def __getitem__(self, i):
         """ You can iterate thru tag content: for content in tag ... """
-        return self.__dict__['content'][i]
+        return self.content[i]
     
+    def changed(self):
+        """ Mark tag changed, so that cached renderings of it and of the tags containing it are not used any more. """
+        object.__setattr__(self, '_version', self._version + 1)
+        return self
+
     def _repr_html_(self):
         """ Makes possible to render html in IPython notebook environment rather than representing tag in string format """
         return self.__str__()
     def __str__(self):
         """ Represent tag in string format """
-        if self.__dict__['content']:
-            return '<%s%s>%s</%s>' % (self.__class__.__name__, strattr(self.__dict__['attributes']),
-                                      concat(*self.__dict__['content']), self.__class__.__name__)
-        else:
-            return '<%s%s/>' % (self.__class__.__name__, strattr(self.__dict__['attributes']))
+        html = self._cached()
+        if html is not None:
+            return html
+        tags = []
+        html = ''.join(self._chunks(tags))
+        # content produced by callables may differ from call to call, so it's never cached
+        if None not in tags:
+            object.__setattr__(self, '_cache', (tags, [tag._version for tag in tags], html))
+        return html
+
+    def _cached(self):
+        """ Cached html, if none of the tags rendered in it has changed since, otherwise None """
+        cache = self._cache
+        if cache is not None and [tag._version for tag in cache[0]] == cache[1]:
+            return cache[2]
+        return None
+
+    def rendered_content(self):
+        """
+        Content as it is serialized. Extended tags override this to add their own parts,
+        like table caption and rows, without changing the content list itself.
+        """
+        return self.content
+
+    def iter_chunks(self):
+        """
+        Serialize tag and its content fragment by fragment. Tree is walked once with an explicit
+        stack, so no subtree is copied into intermediate strings and deep trees don't recurse.
+        """
+        return self._chunks([])
+
+    def _chunks(self, tags):
+        """ See iter_chunks. Tags rendered are appended to tags, and None when a callable was called for content. """
+        tags.append(self)
+        name = self.__class__.__name__
+        content = self.rendered_content()
+        if not content:
+            yield '<%s%s/>' % (name, strattr(self.attributes))
+            return
+        yield '<%s%s>' % (name, strattr(self.attributes))
+        # pairs of content iterator and closing tag
+        stack = [(iter(content), '</%s>' % name)]
+        while stack:
+            items, closing = stack[-1]
+            for item in items:
+                if callable(item):
+                    tags.append(None)
+                    item = item()
+                if isinstance(item, TAG) and type(item).__str__.__func__ is _tag_str:
+                    html = item._cached()
+                    if html is not None:
+                        tags.extend(item._cache[0])
+                        yield html
+                        continue
+                    tags.append(item)
+                    name = item.__class__.__name__
+                    content = item.rendered_content()
+                    if content:
+                        yield '<%s%s>' % (name, strattr(item.attributes))
+                        stack.append((iter(content), '</%s>' % name))
+                        break
+                    yield '<%s%s/>' % (name, strattr(item.attributes))
+                else:
+                    yield str(item)
+            else:
+                stack.pop()
+                yield closing
+
+    def write_to(self, stream, buffer_size = 65536):
+        """ Write tag to a file-like stream, for example a file or a socket file, without building the whole string """
+        buffer, size = [], 0
+        for chunk in self.iter_chunks():
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= buffer_size:
+                stream.write(''.join(buffer))
+                buffer, size = [], 0
+        if buffer:
+            stream.write(''.join(buffer))
+
+# tags rendered by TAG.__str__ are serialized inline by iter_chunks, others through their own __str__
+_tag_str = TAG.__dict__['__str__']
 
 class htmlHelper(object):
+    """
+    Tag classes are created once per tag name and reused after that. Creating a new class
+    for every element was slow and left lots of garbage behind on big tables.
+    """
+    def __init__(self):
+        self._classes = {}
+    def _class(self, tag):
+        try:
+            return self._classes[tag]
+        except KeyError:
+            cls = self._classes[tag] = type(tag, (TAG,), {'__slots__': ()})
+            return cls
     def create(self, tag):
-        return type(tag, (TAG,), {})()
+        return self._class(tag)()
     def __getattr__(self, tag):
-        return type(tag.lower(), (TAG,), {})
+        return self._class(tag.lower())
     
 def concat(*args):
     return ''.join(map(lambda x: str(x()) if callable(x) else str(x), args))
@@ -44,14 +44,17 @@ def svg(*args, **kw):
         
         def set_grid(self, grid = True):
             self.__dict__['grid'] = grid
+            self.changed()
             return self
         
         def set_axes(self, axes = True):
             self.__dict__['axes'] = axes
+            self.changed()
             return self
         
         def set_origin(self, origin = True):
             self.__dict__['origin'] = origin
+            self.changed()
             return self
         
         def set_size(self, width, height):
@@ -67,20 +70,24 @@ def svg(*args, **kw):
             kw['x'] = self.__dict__['x']+kw['x'] if kw.has_key('x') else self.__dict__['x'] 
             kw['y'] = self.__dict__['y']-kw['y'] if kw.has_key('y') else self.__dict__['y']
             self.__dict__['elements'].append(helper.text(*args, **kw))
+            self.changed()
             return self
         
         def set_rectangle(self, *args, **kw):
             kw['x'] = self.__dict__['x']+kw['x'] if kw.has_key('x') else self.__dict__['x']
             kw['y'] = self.__dict__['y']-kw['y'] if kw.has_key('y') else self.__dict__['y']
             self.__dict__['elements'].append(helper.rect(*args, **kw))
+            self.changed()
             return self
         
         def set_group(self, *args, **kw):
             self.__dict__['elements'].append(helper.g(*args, **kw))
+            self.changed()
             return self
         
         def set_defs(self, *args, **kw):
             self.__dict__['elements'].append(helper.defs(*args, **kw))
+            self.changed()
             return self
         
         def set_line(self, *args, **kw):
@@ -89,12 +96,14 @@ def svg(*args, **kw):
             kw['x2'] = self.__dict__['x']+kw['x2'] if kw.has_key('x2') else self.__dict__['x'] + 10
             kw['y2'] = self.__dict__['y']-kw['y2'] if kw.has_key('y2') else self.__dict__['y'] + 10
             self.__dict__['elements'].append(helper.line(*args, **kw))
+            self.changed()
             return self
         
         def set_circle(self, *args, **kw):
             kw['cx'] = self.__dict__['x']+kw['cx'] if kw.has_key('cx') else self.__dict__['x']
             kw['cy'] = self.__dict__['y']-kw['cy'] if kw.has_key('cy') else self.__dict__['y']
             self.__dict__['elements'].append(helper.circle(*args, **kw))
+            self.changed()
             return self
         
         def set_triangle(self, *args, **kw):
@@ -134,6 +143,7 @@ def svg(*args, **kw):
             del kw['degrees']
             # create polygon with given points and keywords
             self.__dict__['elements'].append(helper.polygon(points=points, *args, **kw))
+            self.changed()
             return self
         
         def polygon_points(self, vertex):
@@ -150,44 +160,45 @@ def svg(*args, **kw):
                 points.append([x,y])
             return points
         
-        def _set_grid(self):
-            """ Set up background grid for drawing canvas """
+        def _grid(self):
+            """ Background grid elements for drawing canvas """
             grid_sizex = self.__dict__['size'][0]/self.__dict__['grid_aspects'][0]
             grid_sizey = self.__dict__['size'][1]/self.__dict__['grid_aspects'][0]
             
             sizex = grid_sizex*(1.0/self.__dict__['grid_aspects'][1])
             sizey = grid_sizey*(1.0/self.__dict__['grid_aspects'][1])
             
-            defs = helper.defs()
-            defs += helper.pattern(helper.path(**{'d': 'M %s 0 L 0 0 0 %s' % (sizex, sizey), 'fill': 'none', 'stroke': 'gray', 'stroke-width': 0.5}),
-                                   **{'id': self.__dict__['grid_item_id'], 'width': sizex, 'height': sizey, 'patternUnits': 'userSpaceOnUse'})
-            defs += helper.pattern(helper.path(**{'d': 'M %s 0 L 0 0 0 %s' % (grid_sizex, grid_sizey), 'fill': 'none', 'stroke': 'gray', 'stroke-width': 1}),
-                                   helper.rect(width=grid_sizex, height=grid_sizey, fill="url(#%s)" % self.__dict__['grid_item_id']),
-                                   **{'id': self.__dict__['grid_id'], 'width': grid_sizex, 'height': grid_sizey, 'patternUnits': 'userSpaceOnUse'})
-            self += defs
-            self += helper.rect(fill="white", height=self.__dict__['size'][0]+1, width=self.__dict__['size'][1]+1)
-            self += helper.rect(fill="url(#%s)" % self.__dict__['grid_id'], height=self.__dict__['size'][0]+1, width=self.__dict__['size'][1]+1)
+            item = helper.pattern(helper.path(**{'d': 'M %s 0 L 0 0 0 %s' % (sizex, sizey), 'fill': 'none', 'stroke': 'gray', 'stroke-width': 0.5}),
+                                  **{'id': self.__dict__['grid_item_id'], 'width': sizex, 'height': sizey, 'patternUnits': 'userSpaceOnUse'})
+            grid = helper.pattern(helper.path(**{'d': 'M %s 0 L 0 0 0 %s' % (grid_sizex, grid_sizey), 'fill': 'none', 'stroke': 'gray', 'stroke-width': 1}),
+                                  helper.rect(width=grid_sizex, height=grid_sizey, fill="url(#%s)" % self.__dict__['grid_item_id']),
+                                  **{'id': self.__dict__['grid_id'], 'width': grid_sizex, 'height': grid_sizey, 'patternUnits': 'userSpaceOnUse'})
+            # built with constructor arguments only, rendering must not change any tag
+            defs = helper.defs(item, grid)
+            return [defs,
+                    helper.rect(fill="white", height=self.__dict__['size'][0]+1, width=self.__dict__['size'][1]+1),
+                    helper.rect(fill="url(#%s)" % self.__dict__['grid_id'], height=self.__dict__['size'][0]+1, width=self.__dict__['size'][1]+1)]
             
-        def _set_axes(self):
-            """ Set up x and y axis for drawing canvas """
-            self += helper.line(stroke="black", x1=self.__dict__['x'], x2=self.__dict__['x'], y1=0, y2=self.__dict__['y']*2)
-            self += helper.line(stroke="black", x1=0, x2=self.__dict__['x']*2, y1=self.__dict__['y'], y2=self.__dict__['y'])
-        
-        def _set_origin(self):
-            """ Set up origin dot and x/y coordinates for drawing canvas """
-            self += helper.circle(cx=self.__dict__['x'], cy=self.__dict__['y'], r=2, fill="black", stroke="black", style="fill-opacity: 50%")
-            self += helper.text("(0,0)", x=self.__dict__['x']+5, y=self.__dict__['y']-5, style="fill-opacity: 50%")
-        
-        def __str__(self):
+        def _axes(self):
+            """ X and y axis elements for drawing canvas """
+            return [helper.line(stroke="black", x1=self.__dict__['x'], x2=self.__dict__['x'], y1=0, y2=self.__dict__['y']*2),
+                    helper.line(stroke="black", x1=0, x2=self.__dict__['x']*2, y1=self.__dict__['y'], y2=self.__dict__['y'])]
+        
+        def _origin(self):
+            """ Origin dot and x/y coordinates elements for drawing canvas """
+            return [helper.circle(cx=self.__dict__['x'], cy=self.__dict__['y'], r=2, fill="black", stroke="black", style="fill-opacity: 50%"),
+                    helper.text("(0,0)", x=self.__dict__['x']+5, y=self.__dict__['y']-5, style="fill-opacity: 50%")]
+        
+        def rendered_content(self):
+            """ Content followed by grid, axes, origin and drawn elements. Content list itself is left untouched. """
+            content = list(self.content)
             if self.__dict__['grid']:
-                self._set_grid()
+                content.extend(self._grid())
             if self.__dict__['axes']:
-                self._set_axes()
+                content.extend(self._axes())
             if self.__dict__['origin']:
-                self._set_origin()
-            if self.__dict__['elements']:
-                for element in self.__dict__['elements']:
-                    self += element
-            return super(self.__class__, self).__str__()
+                content.extend(self._origin())
+            content.extend(self.__dict__['elements'])
+            return content
     
     return svg(*args, **kw)
\ No newline at end of file
@@ -27,6 +27,7 @@ def table(*args, **kw):
             if not self.__dict__.has_key('caption'):
                 self.__dict__['caption'] = helper.caption(**kw)
             self.__dict__['caption'].addContent(caption)
+            self.changed()
             return self
         
         def addColGroup(self, *cols, **kw):
@@ -37,6 +38,7 @@ def table(*args, **kw):
                 self.__dict__['colgroup'] = helper.colgroup(**kw)
             for col in cols:
                 self.__dict__['colgroup'].addContent(col)
+            self.changed()
             return self
         
         def addHeadRow(self, *trs, **kw):
@@ -44,6 +46,7 @@ def table(*args, **kw):
                 self.__dict__['thead'] = helper.thead(**kw)
             for tr in trs:
                 self.__dict__['thead'].addContent(tr)
+            self.changed()
             return self
         
         def addFootRow(self, *trs, **kw):
@@ -51,6 +54,7 @@ def table(*args, **kw):
                 self.__dict__['tfoot'] = helper.tfoot(**kw)
             for tr in trs:
                 self.__dict__['tfoot'].addContent(tr)
+            self.changed()
             return self
         
         def addBodyRow(self, *trs, **kw):
@@ -59,6 +63,7 @@ def table(*args, **kw):
                 self.__dict__['tbody'] = helper.tbody(**kw)
             for tr in trs:
                 self.__dict__['tbody'].addContent(tr)
+            self.changed()
             return self
         
         def addBodyRows(self, *trs, **kw):
@@ -66,21 +71,16 @@ def table(*args, **kw):
             if not self.__dict__.has_key('tbodys'):
                 self.__dict__['tbodys'] = []
             self.__dict__['tbodys'].append(helper.tbody(*trs, **kw))
+            self.changed()
             return self
         
-        def __str__(self):
-            if self.__dict__.has_key('caption'):
-                self.addContent(self.__dict__['caption'])
-            if self.__dict__.has_key('colgroup'):
-                self.addContent(self.__dict__['colgroup'])
-            if self.__dict__.has_key('thead'):
-                self.addContent(self.__dict__['thead'])
-            if self.__dict__.has_key('tfoot'):
-                self.addContent(self.__dict__['tfoot'])
-            if self.__dict__.has_key('tbody'):
-                self.addContent(self.__dict__['tbody'])
-            if self.__dict__.has_key('tbodys'):
-                map(self.addContent, self.__dict__['tbodys'])
-            return super(self.__class__, self).__str__()
+        def rendered_content(self):
+            """ Content followed by the table parts in html order. Content list itself is left untouched. """
+            content = list(self.content)
+            for part in ('caption', 'colgroup', 'thead', 'tfoot', 'tbody'):
+                if self.__dict__.has_key(part):
+                    content.append(self.__dict__[part])
+            content.extend(self.__dict__.get('tbodys', ()))
+            return content
     
     return table(*args, **kw)
\ No newline at end of file
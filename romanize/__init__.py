@@ -2,4 +2,23 @@
 # -*- coding: utf-8 -*-
 # file: __init__.py
 
+import sys
+from types import ModuleType
 from main import *
+
+class _Package(ModuleType):
+    """
+    Package module that imports registered scripts on first attribute access, so that
+    romanize.he.convert(...) works without importing romanize.he first. Python 2 modules
+    can't define __getattr__ themselves, hence the module subclass.
+    """
+    def __getattr__(self, name):
+        if name in registry:
+            return get(name)
+        raise AttributeError("'module' object has no attribute '%s'" % name)
+
+_package = _Package(__name__, __doc__)
+_package.__dict__.update(sys.modules[__name__].__dict__)
+# python 2 clears the globals of a module when it is garbage collected, keep the original alive
+_package._module = sys.modules[__name__]
+sys.modules[__name__] = _package
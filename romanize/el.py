@@ -3,6 +3,8 @@
 # file: el.py
 
 import re
+import sys
+import unicodedata
 from collections import OrderedDict
 from romanizer import Romanizer
 
@@ -158,13 +160,39 @@ for letter, values in _accents_.iteritems():
     for value in values.split():
         accents[value] = letter
 
-regex1 = re.compile('|'.join(accents.keys()))
 # collect greek and roman letters from data dictionary
 letters = ''.join([''.join(d['letter'])+\
           ''.join(d['letter']).upper()+\
           d['roman']+\
           d['roman'].upper() for key, d in data.items()])
-regex2 = re.compile('[^%s ]+' % letters)
+
+# greek and coptic, greek extended
+greek_blocks = [(0x0370, 0x03ff), (0x1f00, 0x1fff)]
+
+def build_preprocess_table():
+    """
+    Codepoint list of the basic multilingual plane for unicode.translate, doing accent folding
+    and removal of unwanted characters in one pass. Letters and space map to themselves and
+    accented letters to their simple forms. Other greek characters whose canonical decomposition
+    (NFD) is a known letter with combining marks fold to that letter. Everything else, combining
+    marks of decomposed input included, maps to None and is removed.
+    """
+    table = [None] * 0x10000
+    for letter in letters + u' ':
+        table[ord(letter)] = letter
+    for value, letter in accents.items():
+        table[ord(value)] = letter
+    for first, last in greek_blocks:
+        for codepoint in range(first, last + 1):
+            decomposed = unicodedata.normalize('NFD', unichr(codepoint))
+            if table[codepoint] is None and len(decomposed) > 1:
+                table[codepoint] = table[ord(decomposed[0])]
+    return table
+
+preprocess_table = build_preprocess_table()
+
+# translate keeps characters beyond the table, on wide python builds they are removed separately
+regex_astral = re.compile(u'[^\x00-\uffff]+') if sys.maxunicode > 0xffff else None
 
 def preprocess(string):
     """
@@ -172,11 +200,19 @@ def preprocess(string):
     :param string:
     :return:
     """
-    string = unicode(string, encoding="utf-8")
-    # convert diacritics to simpler forms
-    string = regex1.sub(lambda x: accents[x.group()], string)
-    # remove all rest of the unwanted characters
-    return regex2.sub('', string).encode('utf-8')
+    return unicode_preprocess(unicode(string, encoding="utf-8")).encode('utf-8')
+
+def unicode_preprocess(string):
+    """
+    Same as preprocess, but unicode in and unicode out
+    :param string:
+    :return:
+    """
+    # convert diacritics to simpler forms and remove all rest of the unwanted characters
+    string = string.translate(preprocess_table)
+    if regex_astral is not None and regex_astral.search(string):
+        string = regex_astral.sub(u'', string)
+    return string
 
 def convert(string, sanitize=False):
     """
@@ -187,3 +223,26 @@ def convert(string, sanitize=False):
     :return:
     """
     return r.convert(string, (preprocess if sanitize else False))
+
+def convert_many(strings, sanitize=False):
+    """
+    Convert a batch of strings at once. Optionally sanitize strings by using preprocess function.
+
+    :param sanitize:
+    :param strings:
+    :return:
+    """
+    return r.convert_many(strings, (preprocess if sanitize else False))
+
+def convert_stream(infile, outfile, sanitize=False, chunk_size=65536):
+    """
+    Convert utf-8 text from file-like infile to outfile in chunks of chunk_size bytes.
+    Optionally sanitize text by using preprocess function.
+
+    :param infile:
+    :param outfile:
+    :param sanitize:
+    :param chunk_size:
+    :return:
+    """
+    return r.convert_stream(infile, outfile, (unicode_preprocess if sanitize else None), chunk_size)
@@ -96,8 +96,15 @@ def preprocess(string):
     :param string:
     :return:
     """
-    string = unicode(string, encoding="utf-8")
-    return regex.sub('', string).encode('utf-8')
+    return unicode_preprocess(unicode(string, encoding="utf-8")).encode('utf-8')
+
+def unicode_preprocess(string):
+    """
+    Same as preprocess, but unicode in and unicode out
+    :param string:
+    :return:
+    """
+    return regex.sub('', string)
 
 def convert(string, sanitize=False):
     """
@@ -109,3 +116,25 @@ def convert(string, sanitize=False):
     """
     return r.convert(string, (preprocess if sanitize else False))
 
+def convert_many(strings, sanitize=False):
+    """
+    Convert a batch of strings at once. Optionally sanitize strings by using preprocess function.
+
+    :param sanitize:
+    :param strings:
+    :return:
+    """
+    return r.convert_many(strings, (preprocess if sanitize else False))
+
+def convert_stream(infile, outfile, sanitize=False, chunk_size=65536):
+    """
+    Convert utf-8 text from file-like infile to outfile in chunks of chunk_size bytes.
+    Optionally sanitize text by using preprocess function.
+
+    :param infile:
+    :param outfile:
+    :param sanitize:
+    :param chunk_size:
+    :return:
+    """
+    return r.convert_stream(infile, outfile, (unicode_preprocess if sanitize else None), chunk_size)
@@ -2,4 +2,55 @@
 # -*- coding: utf-8 -*-
 # file: main.py
 
-import el, he
\ No newline at end of file
+import importlib
+
+"""
+Script registry. Script modules are imported, and their tables compiled, only when
+a script is used for the first time:
+
+import romanize
+romanize.get('el').convert('λογος') -> 'logos'
+
+Third-party scripts can register themselves either as modules or as import paths:
+
+romanize.register('xx', 'mypackage.xx')
+
+Script module must provide convert and preprocess functions like romanize.el does.
+"""
+
+class RomanizeException(Exception):
+    pass
+
+package = __name__.rpartition('.')[0]
+
+# script name -> module or dotted import path of the module
+registry = dict((name, '%s.%s' % (package, name)) for name in ['el', 'he', 'ar', 'co', 'sa'])
+
+# script name -> loaded module
+scripts = {}
+
+def register(name, script):
+    """
+    Register script module by name. Script is either a module or a dotted import path,
+    which is imported on the first get. Registering an existing name replaces it.
+    """
+    registry[name] = script
+    scripts.pop(name, None)
+
+def get(name):
+    """ Script module by name, imported on first use and cached after that """
+    try:
+        return scripts[name]
+    except KeyError:
+        pass
+    if name not in registry:
+        raise RomanizeException("Script '%s' is not registered" % name)
+    script = registry[name]
+    if isinstance(script, basestring):
+        script = importlib.import_module(script)
+    scripts[name] = script
+    return script
+
+def available():
+    """ Names of the registered scripts, loaded or not """
+    return sorted(registry.keys())
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 # file: romanizer.py
 
+import codecs
 import re
+import unicodedata
 
 class Romanizer(object):
 
@@ -19,12 +21,42 @@ class Romanizer(object):
             if add_uppercase:
                 self.substitutes[d['roman'].upper()] = d['letter'][0].upper()
 
-        if len(self.substitutes):
-            self.regex = re.compile('|'.join(self.substitutes.keys()))
+        self.regex = None
+        self.table = None
+        # single characters are swapped in one pass with unicode.translate
+        singles = dict((ord(key), value) for key, value in self.substitutes.items() if len(key) == 1)
+        if singles:
+            self.table = singles
+        # only multi-character keys need a regex, longest keys are tried first
+        multiples = sorted((key for key in self.substitutes if len(key) > 1), key=len, reverse=True)
+        if multiples:
+            self.regex = re.compile('(%s)' % '|'.join(map(re.escape, multiples)))
 
     def preprocess(self):
         pass
 
+    def unicode_convert(self, string, preprocess = None):
+        """
+        Same as convert, but string and optional preprocess function are unicode in and unicode out.
+
+        :param preprocess:
+        :param string:
+        :return:
+        """
+        if preprocess:
+            string = preprocess(string)
+        if self.regex:
+            # multi-character keys at odd indexes, text between them at even indexes
+            parts = self.regex.split(string)
+            parts[1::2] = [self.substitutes[key] for key in parts[1::2]]
+            if self.table:
+                parts[::2] = [part.translate(self.table) for part in parts[::2]]
+            return u''.join(parts)
+        elif self.table:
+            return string.translate(self.table)
+        else:
+            return string
+
     def convert(self, string, preprocess = None):
         """
         Swap characters from script to roman and vice versa. Optionally sanitize string by using preprocess function.
@@ -34,7 +66,52 @@ class Romanizer(object):
         :return:
         """
         string = unicode(preprocess(string) if preprocess else string, encoding="utf-8")
-        if self.regex:
-            return self.regex.sub(lambda x: self.substitutes[x.group()], string).encode('utf-8')
-        else:
-            return string
\ No newline at end of file
+        return self.unicode_convert(string).encode('utf-8')
+
+    def convert_many(self, strings, preprocess = None):
+        """
+        Convert a batch of strings. Strings are joined with NUL characters, decoded, converted
+        and encoded only once and split back to a list.
+
+        :param preprocess:
+        :param strings:
+        :return:
+        """
+        strings = [preprocess(string) for string in strings] if preprocess else list(strings)
+        joined = '\x00'.join(strings)
+        if joined.count('\x00') != len(strings) - 1:
+            # NUL characters inside of the strings
+            return [self.convert(string) for string in strings]
+        return self.convert(joined).split('\x00') if strings else []
+
+    def convert_stream(self, infile, outfile, preprocess = None, chunk_size = 65536):
+        """
+        Convert utf-8 text from file-like infile to outfile chunk by chunk, so memory use stays
+        flat regardless of the file size. Optional preprocess function is unicode in and unicode out.
+
+        Multibyte characters split between chunks are completed by an incremental decoder, and
+        the last character of every chunk is held back with its combining marks until the next
+        chunk, so a character and its diacritics are always converted together.
+
+        :param infile:
+        :param outfile:
+        :param preprocess:
+        :param chunk_size:
+        :return:
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        pending = u''
+        while True:
+            chunk = infile.read(chunk_size)
+            text = pending + decoder.decode(chunk, final=not chunk)
+            pending = u''
+            if chunk:
+                cut = len(text)
+                while cut and unicodedata.combining(text[cut-1]):
+                    cut -= 1
+                cut = max(cut - 1, 0)
+                text, pending = text[:cut], text[cut:]
+            if text:
+                outfile.write(self.unicode_convert(text, preprocess).encode('utf-8'))
+            if not chunk:
+                break
@@ -18,6 +18,14 @@ def preprocess(string):
     """
     return string
 
+def unicode_preprocess(string):
+    """
+    Same as preprocess, but unicode in and unicode out
+    :param string:
+    :return:
+    """
+    return string
+
 def convert(string, sanitize=False):
     """
     Swap characters from script to roman and vice versa. Optionally sanitize string by using preprocess function.
@@ -26,4 +34,27 @@ def convert(string, sanitize=False):
     :param string:
     :return:
     """
-    return r.convert(string, (preprocess if sanitize else False))
\ No newline at end of file
+    return r.convert(string, (preprocess if sanitize else False))
+
+def convert_many(strings, sanitize=False):
+    """
+    Convert a batch of strings at once. Optionally sanitize strings by using preprocess function.
+
+    :param sanitize:
+    :param strings:
+    :return:
+    """
+    return r.convert_many(strings, (preprocess if sanitize else False))
+
+def convert_stream(infile, outfile, sanitize=False, chunk_size=65536):
+    """
+    Convert utf-8 text from file-like infile to outfile in chunks of chunk_size bytes.
+    Optionally sanitize text by using preprocess function.
+
+    :param infile:
+    :param outfile:
+    :param sanitize:
+    :param chunk_size:
+    :return:
+    """
+    return r.convert_stream(infile, outfile, (unicode_preprocess if sanitize else None), chunk_size)